@@ -2,106 +2,436 @@
 
 import sys
 import os
+import hashlib
+import logging
+import shutil
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-import traceback
+from typing import Dict, FrozenSet, List, MutableMapping, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables from .env.local
 env_path = Path(__file__).parent / '.env.local'
 load_dotenv(env_path)
 
-# Configure Gemini with API key
-import google.generativeai as genai
+# Gemini is configured from GOOGLE_API_KEY on first use (see parsers.media_description)
 if 'GOOGLE_API_KEY' not in os.environ:
     os.environ['GOOGLE_API_KEY'] = os.getenv('GEMINI_API_KEY', '')  # Try alternate name if exists
-genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
 
-from parsers.platforms import PLATFORMS, extract_platforms_from_file
+from parsers.platforms import (
+    PLATFORMS,
+    PLATFORMS_MANIFEST_NAME,
+    PLATFORMS_SET,
+    extract_platforms,
+    load_platforms_manifest,
+    save_platforms_manifest,
+)
 from parsers.utils import get_workspace_root
-from parsers.meta import extract_meta_from_file, convert_meta_to_frontmatter
+from parsers.meta import extract_meta_from_file, convert_meta_to_frontmatter, read_mdx_file
 from parsers.fragments import process_fragments
 from parsers.filters import process_inline_filters
 from parsers.components import embed_protected_redaction_message
 from parsers.imports import remove_imports
 from parsers.media import process_media_in_content
+from parsers import media_description
 
-def process_directory(in_dir: Path, out_dir: Path, platform: str):
-    """Process a directory and its subdirectories.
+log = logging.getLogger(__name__)
+
+# Log records are printed like plain output; --verbose enables DEBUG
+LOG_FORMAT = "%(message)s"
+
+# Content digest -> first output path written with that content. Platform
+# workers swap this for a dict shared through a multiprocessing Manager.
+WRITTEN_OUTPUTS: MutableMapping[bytes, str] = {}
+
+# Parsed source tree rendered by a platform worker, set by init_worker
+WORKER_TREE: Optional["TreeNode"] = None
+
+@dataclass
+class TreeNode:
+    """A source directory with its index.mdx parsed once for all platforms."""
+    name: str
+    index_file: Optional[Path] = None
+    workspace_root: Optional[Path] = None
+    platforms: Optional[FrozenSet[str]] = None
+    # Raw index.mdx text read by the platform scan, dropped once parsed
+    source: Optional[str] = None
+    meta: Dict = field(default_factory=dict)
+    frontmatter: str = ""
+    content: str = ""
+    children: List["TreeNode"] = field(default_factory=list)
+
+# Directories that are never converted
+SKIPPED_DIRS = ("gen1", "[category]")
+
+# Files handed to each parse worker at a time
+PARSE_CHUNKSIZE = 32
+
+def get_mp_context() -> multiprocessing.context.BaseContext:
+    """Get the multiprocessing context for worker pools.
+    
+    Forked workers inherit the imported modules and compiled regexes
+    instead of re-importing everything. Only on Linux, where fork is
+    safe; elsewhere use the platform default (spawn).
+    """
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+def build_tree(
+    in_dir: Path,
+    platforms: List[str] = PLATFORMS,
+    manifest: Optional[Dict[str, Dict]] = None,
+    workers: int = 1
+) -> Optional[TreeNode]:
+    """Walk a source directory once, reading and parsing each index.mdx.
     
     Args:
         in_dir: Input directory containing MDX files
-        out_dir: Output directory for MD files
-        platform: Current platform to process
+        platforms: Platforms the tree will be rendered for. Subtrees whose
+            index.mdx, or an ancestor's, excludes all of them are not walked.
+        manifest: Optional platforms manifest keyed by paths relative to
+            in_dir. Entries whose mtime still matches are used instead of
+            reading index.mdx, and new entries are added in place.
+        workers: Number of processes used to parse the index.mdx files
+        
+    Returns:
+        The root TreeNode, or None if the directory is skipped
     """
     # Skip gen1 and [category] directories
-    if "gen1" in in_dir.parts or "[category]" in in_dir.parts:
-        return
+    if any(part in SKIPPED_DIRS for part in Path(in_dir).parts):
+        return None
+    
+    platforms = frozenset(platforms)
+    root = None
+    to_parse = []
+    
+    # Walk with an explicit stack of (directory, path relative to in_dir,
+    # parent node, platforms the directory can still be rendered for)
+    stack = [(os.fspath(in_dir), ".", None, platforms)]
+    while stack:
+        dir_path, rel_dir, parent, dir_platforms = stack.pop()
+        node, subdirs = _build_node(dir_path, dir_platforms, manifest, rel_dir)
+        if node is None:
+            continue
+        
+        if parent is None:
+            root = node
+        else:
+            parent.children.append(node)
+        if node.index_file is not None:
+            to_parse.append(node)
+        
+        # render_tree skips a whole subtree for platforms its root excludes, so
+        # children only need to match what this directory still allows
+        if node.platforms is not None:
+            dir_platforms = dir_platforms & node.platforms
+        
+        # Pushed in reverse so directories are visited in scan order
+        for subdir_path, subdir_name in reversed(subdirs):
+            child_rel_dir = subdir_name if rel_dir == "." else os.path.join(rel_dir, subdir_name)
+            stack.append((subdir_path, child_rel_dir, node, dir_platforms))
+    
+    # Each index.mdx parses independently, so spread them over processes
+    # Pages whose platforms came from the manifest have no source yet and
+    # are read by the parser
+    index_files = [node.index_file for node in to_parse]
+    sources = [node.source for node in to_parse]
+    if workers > 1 and len(index_files) > PARSE_CHUNKSIZE:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_mp_context()) as executor:
+            parsed = list(executor.map(extract_meta_from_file, index_files, sources, chunksize=PARSE_CHUNKSIZE))
+    else:
+        parsed = map(extract_meta_from_file, index_files, sources)
+    for node, (meta, content) in zip(to_parse, parsed):
+        node.meta, node.content = meta, content
+        node.source = None
+        # Located and rendered once here rather than once per platform
+        if meta:
+            node.workspace_root = get_workspace_root(node.index_file)
+            node.frontmatter = convert_meta_to_frontmatter(meta)
+    
+    return root
+
+def _build_node(
+    in_dir: str,
+    platforms: FrozenSet[str],
+    manifest: Optional[Dict[str, Dict]],
+    rel_dir: str
+) -> Tuple[Optional[TreeNode], List[Tuple[str, str]]]:
+    """Build the TreeNode for one directory, returning it with its (path, name) subdirectories.
+    
+    Paths stay plain strings while walking. The node is None if the
+    directory is excluded for every requested platform. Its index.mdx is
+    only located here, build_tree parses it.
+    """
+    node = TreeNode(name=os.path.basename(in_dir))
+    
+    # Scan the directory once; DirEntry reuses the file type from readdir
+    # so this avoids a separate stat() for every entry
+    index_entry = None
+    subdirs = []
+    with os.scandir(in_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name not in SKIPPED_DIRS:
+                    subdirs.append((entry.path, entry.name))
+            elif entry.name == "index.mdx" and entry.is_file():
+                index_entry = entry
         
     # Check index.mdx for platform filtering
-    index_file = in_dir / "index.mdx"
-    if index_file.is_file():
-        dir_platforms = extract_platforms_from_file(index_file)
-        # If meta.platforms is specified and doesn't include our platform, skip
-        if dir_platforms and platform not in dir_platforms:
-            return
+    if index_entry is not None:
+        index_file = Path(in_dir, "index.mdx")
+        cached = None
+        if manifest is not None:
+            mtime_ns = index_entry.stat().st_mtime_ns
+            cached = manifest.get(rel_dir)
+            if cached and cached.get("mtime_ns") != mtime_ns:
+                cached = None
+        
+        if cached:
+            cached_platforms = cached.get("platforms")
+            node.platforms = frozenset(cached_platforms) if cached_platforms is not None else None
+        else:
+            # Only scan the platforms field here so excluded directories skip
+            # the full parse. The text is kept so the parse needn't read it again.
+            try:
+                node.source = read_mdx_file(index_file)
+            except (OSError, UnicodeDecodeError) as e:
+                # Rendered with no meta rather than aborting the whole walk,
+                # and not recorded so the next run reads the file again
+                log.error("Error reading %s: %s", index_file, e)
+                node.source = ""
+                if manifest is not None:
+                    manifest.pop(rel_dir, None)
+            else:
+                node.platforms = extract_platforms(node.source)
+                if manifest is not None:
+                    manifest[rel_dir] = {
+                        "mtime_ns": mtime_ns,
+                        "platforms": sorted(node.platforms) if node.platforms is not None else None
+                    }
+        
+        # Nothing below here gets rendered if no requested platform is included
+        if node.platforms is not None and node.platforms.isdisjoint(platforms):
+            return None, []
+        
+        # Parsed later by build_tree, possibly in a worker process
+        node.index_file = index_file
+    
+    return node, subdirs
+
+def write_output(output_path: str, text: str) -> None:
+    """Write an output file, hardlinking it to an earlier identical output.
+    
+    Most pages render the same for every platform, so only the first copy
+    is written and later ones are linked to it. A file left by a previous
+    run with the same content is kept as it is. New files are built under a
+    temporary name and renamed over the old one, which never writes through
+    a link left by a previous run. A digest is only published once its file
+    holds the final content, so other workers never link to a stale file.
+    
+    Args:
+        output_path: Path of the file to write
+        text: Full file content
+    """
+    data = text.encode('utf-8')
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    output_path = os.path.abspath(output_path)
+    
+    try:
+        existing_size = os.stat(output_path).st_size
+    except FileNotFoundError:
+        existing_size = None
+    
+    # Unchanged since the previous run, leave it alone
+    if existing_size == len(data):
+        with open(output_path, 'rb') as f:
+            if f.read() == data:
+                WRITTEN_OUTPUTS.setdefault(digest, output_path)
+                return
+    
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    first_path = WRITTEN_OUTPUTS.get(digest)
+    try:
+        linked = False
+        if first_path is not None:
+            try:
+                os.link(first_path, tmp_path)
+                linked = True
+            except OSError:
+                # Cross-device or no hardlink support
+                try:
+                    shutil.copyfile(first_path, tmp_path)
+                    linked = True
+                except OSError:
+                    pass
         
+        if not linked:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        # Don't leave the temporary file in the output tree
         try:
-            # Get workspace root
-            workspace_root = get_workspace_root(index_file)
-            
-            # First get the meta and raw content
-            meta, content = extract_meta_from_file(index_file)
-            if meta:
-                # Process fragments with the current platform
-                content = process_fragments(content, index_file, platform, workspace_root)
-                
-                # Process InlineFilter blocks
-                content = process_inline_filters(content, platform)
-                
-                # Process protected redaction messages
-                content = embed_protected_redaction_message(content, workspace_root)
-                
-                # Remove all imports
-                content = remove_imports(content, index_file)
-                
-                # Process media elements and add Gemini descriptions
-                content, doc_summary = process_media_in_content(content, workspace_root, platform)
-                
-                # Create output directory
-                out_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Generate frontmatter
-                frontmatter = convert_meta_to_frontmatter(meta)
-                
-                # Combine content with an extra newline after frontmatter
-                final_content = frontmatter + "\n" + content.lstrip()
-                
-                # Ensure exactly one newline at end of file
-                final_content = final_content.rstrip() + '\n'
-                
-                # Write the output file
-                output_path = out_dir / "index.md"
-                output_path.write_text(final_content, encoding='utf-8')
-                
-                # Save doc summary if it exists
-                if doc_summary:
-                    summary_path = out_dir / "summary.txt"
-                    print(f"Saving doc summary to: {summary_path}")
-                    summary_path.write_text(doc_summary, encoding='utf-8')
-                
-        except Exception as e:
-            print(f"Error processing {index_file}: {e}")
-    
-    # Process subdirectories
-    for item in in_dir.iterdir():
-        if item.is_dir():
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    
+    WRITTEN_OUTPUTS.setdefault(digest, output_path)
+
+def render_tree(node: TreeNode, out_dir: str, platform: str) -> None:
+    """Write the MD files for a parsed source tree for one platform.
+    
+    Args:
+        node: Tree built by build_tree
+        out_dir: Output directory for MD files, as a plain string path
+        platform: Current platform to process
+    """
+    # Walk with an explicit stack of (node, output directory)
+    stack = [(node, out_dir)]
+    while stack:
+        node, out_dir = stack.pop()
+        
+        # If meta.platforms is specified and doesn't include our platform, skip
+        if node.platforms is not None and platform not in node.platforms:
+            continue
+        
+        if node.meta:
+            _render_node(node, out_dir, platform)
+        
+        # Process subdirectories, pushed in reverse to keep their order
+        for child in reversed(node.children):
             # Replace [platform] with the actual platform in the output path
-            out_subdir = out_dir
-            if item.name == "[platform]":
+            if child.name == "[platform]":
                 out_subdir = out_dir
             else:
-                out_subdir = out_dir / item.name
-            process_directory(item, out_subdir, platform)
+                out_subdir = os.path.join(out_dir, child.name)
+            stack.append((child, out_subdir))
+
+def _render_node(node: TreeNode, out_dir: str, platform: str, output_name: str = "index.md") -> None:
+    """Convert and write the index.mdx of a single tree node for one platform.
+    
+    Also used by process_single_file, which passes the output file name
+    for pages that aren't index.mdx.
+    """
+    index_file = node.index_file
+    workspace_root = node.workspace_root
+    try:
+        # Process fragments with the current platform
+        content = process_fragments(node.content, index_file, platform, workspace_root)
+        
+        # Process InlineFilter blocks
+        content = process_inline_filters(content, platform)
+        
+        # Process protected redaction messages
+        content = embed_protected_redaction_message(content, workspace_root)
+        
+        # Remove all imports
+        content = remove_imports(content, index_file)
+        
+        # Process media elements and add Gemini descriptions
+        content, doc_summary = process_media_in_content(content, workspace_root, platform)
+        
+        # Create output directory
+        os.makedirs(out_dir, exist_ok=True)
+        
+        # Frontmatter is the same for every platform
+        frontmatter = node.frontmatter
+        
+        # Combine content with an extra newline after frontmatter, ending
+        # with exactly one newline, in a single join
+        body = content.strip()
+        if body:
+            final_content = "".join((frontmatter, "\n", body, "\n"))
+        else:
+            final_content = frontmatter.rstrip() + "\n"
+        
+        # Write the output file
+        write_output(os.path.join(out_dir, output_name), final_content)
+        
+        # Save doc summary if it exists
+        if doc_summary:
+            summary_path = os.path.join(out_dir, "summary.txt")
+            log.debug("Saving doc summary to: %s", summary_path)
+            write_output(summary_path, doc_summary)
+            
+    except Exception as e:
+        log.error("Error processing %s: %s", index_file, e, exc_info=True)
+
+def process_directory(
+    in_dir: Path,
+    out_dir: Path,
+    platform: str,
+    manifest: Optional[Dict[str, Dict]] = None,
+    workers: int = 1
+):
+    """Process a directory and its subdirectories.
+    
+    Args:
+        in_dir: Input directory containing MDX files
+        out_dir: Output directory for MD files
+        platform: Current platform to process
+        manifest: Optional platforms manifest for in_dir, see build_tree
+        workers: Number of processes used to parse the MDX files
+    """
+    tree = build_tree(in_dir, [platform], manifest, workers)
+    if tree:
+        render_tree(tree, os.fspath(out_dir), platform)
+
+def init_worker(
+    num_workers: int,
+    log_level: int,
+    written_outputs: MutableMapping[bytes, str],
+    tree: TreeNode
+) -> None:
+    """Initialize a platform worker process.
+    
+    Each process gets its own Gemini rate limiter, so split the overall
+    request budget between the workers to stay under the API limit.
+    
+    Args:
+        num_workers: Number of worker processes sharing the limit
+        log_level: Logging level of the parent process
+        written_outputs: Shared WRITTEN_OUTPUTS so platforms can link to
+            each other's files
+        tree: Parsed source tree, handed over once per worker rather than
+            pickled again for every platform
+    """
+    global WRITTEN_OUTPUTS, WORKER_TREE
+    
+    # Spawned workers don't inherit the parent's logging setup
+    logging.basicConfig(level=log_level, format=LOG_FORMAT)
+    
+    WRITTEN_OUTPUTS = written_outputs
+    WORKER_TREE = tree
+    
+    limiter = media_description.RATE_LIMITER
+    media_description.RATE_LIMITER = media_description.RateLimiter(
+        max_requests=max(1, limiter.max_requests // num_workers),
+        time_window=limiter.time_window
+    )
+
+def process_platform(tree: TreeNode, platform: str) -> None:
+    """Render the whole parsed source tree for a single platform.
+    
+    Args:
+        tree: Tree built from src/pages/[platform] by build_tree
+        platform: Platform to process
+    """
+    print(f"Processing platform: {platform}")
+    
+    # Create output directory for this platform
+    out_dir = os.path.join("llms-docs", platform)
+    
+    # Render the directory tree
+    render_tree(tree, out_dir, platform)
+
+def _process_platform_in_worker(platform: str) -> None:
+    """Render the tree set up by init_worker for a single platform."""
+    process_platform(WORKER_TREE, platform)
 
 def process_single_file(mdx_path: str, platform: str):
     """Process a single MDX file or directory and output the corresponding MD file(s).
@@ -148,62 +478,42 @@ def process_single_file(mdx_path: str, platform: str):
         target_path = target_path / "index.mdx"
     
     try:
-        # Get workspace root for fragment processing
-        workspace_root = get_workspace_root(target_path)
-        
-        # Get meta and raw content
-        meta, content = extract_meta_from_file(target_path)
-        
-        # Process fragments with the current platform
-        processed_content = process_fragments(content, target_path, platform, workspace_root)
-        
-        # Process InlineFilter blocks
-        processed_content = process_inline_filters(processed_content, platform)
-        
-        # Process protected redaction messages
-        processed_content = embed_protected_redaction_message(processed_content, workspace_root)
-        
-        # Remove all imports
-        processed_content = remove_imports(processed_content, target_path)
-        
         # Create output path in llms-docs/[platform]
         relative_path = target_path.relative_to(Path("src/pages/[platform]"))
         out_dir = Path(f"llms-docs/{platform}") / relative_path.parent
-        out_dir.mkdir(parents=True, exist_ok=True)
-        output_path = out_dir / relative_path.name.replace('.mdx', '.md')
-        
-        # Generate frontmatter
-        frontmatter = convert_meta_to_frontmatter(meta)
+        output_name = relative_path.name.replace('.mdx', '.md')
         
-        # Combine content with an extra newline after frontmatter
-        final_content = frontmatter + "\n" + processed_content.lstrip()
-        
-        # Process media elements and add Gemini descriptions
-        final_content, doc_summary = process_media_in_content(final_content, workspace_root, platform)
-        
-        # Ensure exactly one newline at end of file
-        final_content = final_content.rstrip() + '\n'
-        
-        # Write the output file
-        output_path.write_text(final_content, encoding='utf-8')
-        
-        # Save doc summary if it exists
-        if doc_summary:
-            summary_path = output_path.parent / "summary.txt"
-            print(f"Saving doc summary to: {summary_path}")
-            summary_path.write_text(doc_summary, encoding='utf-8')
-            
+        # Get meta and raw content
+        meta, content = extract_meta_from_file(target_path)
     except Exception as e:
-        print(f"Error processing file: {e}")
-        traceback.print_exc()
+        log.error("Error processing file: %s", e, exc_info=True)
+        return
+    
+    # Render it through the same pipeline as a whole-tree run
+    node = TreeNode(
+        name=target_path.parent.name,
+        index_file=target_path,
+        workspace_root=get_workspace_root(target_path),
+        meta=meta,
+        frontmatter=convert_meta_to_frontmatter(meta),
+        content=content
+    )
+    _render_node(node, os.fspath(out_dir), platform, output_name)
 
 def main() -> None:
     """Main entry point for the script."""
+    args = sys.argv[1:]
+    verbose = "--verbose" in args
+    if verbose:
+        args.remove("--verbose")
+    log_level = logging.DEBUG if verbose else logging.WARNING
+    logging.basicConfig(level=log_level, format=LOG_FORMAT)
+    
     # Check arguments
-    if len(sys.argv) == 2:
+    if len(args) == 1:
         # Process entire [platform] directory for a single platform
-        platform = sys.argv[1]
-        if platform not in PLATFORMS:
+        platform = args[0]
+        if platform not in PLATFORMS_SET:
             print(f"Error: Invalid platform '{platform}'. Must be one of: {', '.join(PLATFORMS)}")
             return
             
@@ -216,37 +526,51 @@ def main() -> None:
         # Create output directory for this platform
         out_dir = Path(f"llms-docs/{platform}")
         
-        # Process the directory tree
-        process_directory(src_dir, out_dir, platform)
+        # Process the directory tree, skipping subtrees the manifest excludes
+        manifest_path = Path("llms-docs") / PLATFORMS_MANIFEST_NAME
+        manifest = load_platforms_manifest(manifest_path)
+        process_directory(src_dir, out_dir, platform, manifest, workers=os.cpu_count() or 1)
+        save_platforms_manifest(manifest_path, manifest)
         
-    elif len(sys.argv) == 3:
+    elif len(args) == 2:
         # Process a single file
-        mdx_path = sys.argv[1]
-        platform = sys.argv[2]
+        mdx_path = args[0]
+        platform = args[1]
         process_single_file(mdx_path, platform)
             
     # Original directory processing mode for all platforms
-    elif len(sys.argv) == 1:
+    elif len(args) == 0:
         # Process each platform
         src_dir = Path("src/pages/[platform]")
         if not src_dir.exists():
             print(f"Error: Source directory {src_dir} not found!")
             return
             
-        for platform in PLATFORMS:
-            print(f"Processing platform: {platform}")
-            
-            # Create output directory for this platform
-            out_dir = Path(f"llms-docs/{platform}")
-            
-            # Process the directory tree
-            process_directory(src_dir, out_dir, platform)
+        # Read and parse every index.mdx once, shared by all platforms
+        manifest_path = Path("llms-docs") / PLATFORMS_MANIFEST_NAME
+        manifest = load_platforms_manifest(manifest_path)
+        tree = build_tree(src_dir, PLATFORMS, manifest, workers=os.cpu_count() or 1)
+        save_platforms_manifest(manifest_path, manifest)
+        if tree is None:
+            return
+        
+        # Platforms write to separate output trees, so render them in parallel
+        num_workers = min(len(PLATFORMS), os.cpu_count() or 1)
+        mp_context = get_mp_context()
+        with mp_context.Manager() as manager, ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=mp_context,
+            initializer=init_worker,
+            initargs=(num_workers, log_level, manager.dict(), tree)
+        ) as executor:
+            list(executor.map(_process_platform_in_worker, PLATFORMS))
             
     else:
         print("Usage:")
         print("  For all platforms: python main.py")
         print("  For single platform: python main.py <platform>")
         print("  For single file: python main.py <mdx_file_path> <platform>")
+        print("  Add --verbose to any of these for debug logging")
         print("Example: python main.py nextjs")
         print("Example: python main.py src/pages/[platform]/start/connect-to-aws-resources/index.mdx nextjs")
         return
@@ -1,8 +1,11 @@
 """Functions for handling code blocks in markdown/MDX content."""
 
-import re
 from typing import List, Tuple
 
+# Code blocks run from a fence to the next one, whatever language
+# specifier follows the opening fence, e.g. ```python, ```ts or just ```
+CODE_FENCE = '```'
+
 def split_content_and_code_blocks(content: str) -> List[Tuple[str, bool]]:
     """Split content into alternating non-code and code blocks.
     
@@ -29,21 +32,24 @@ def split_content_and_code_blocks(content: str) -> List[Tuple[str, bool]]:
     parts = []
     current_pos = 0
     
-    # Match code blocks that may have an optional language specifier
-    # e.g. ```python, ```ts, ```json, or just ```
-    code_block_pattern = re.compile(
-        r'(```(?:[a-zA-Z]+\s*\n|[a-zA-Z]*\s*\n|)\s*[\s\S]*?```)',
-        re.DOTALL
-    )
-    
-    for match in code_block_pattern.finditer(content):
+    # Find fences with str.find; the scan is linear and never backtracks
+    while True:
+        start = content.find(CODE_FENCE, current_pos)
+        if start == -1:
+            break
+        end = content.find(CODE_FENCE, start + len(CODE_FENCE))
+        if end == -1:
+            # An unclosed fence, nothing after it can close a block either
+            break
+        end += len(CODE_FENCE)
+        
         # Add non-code content before this block
-        if match.start() > current_pos:
-            parts.append((content[current_pos:match.start()], False))
+        if start > current_pos:
+            parts.append((content[current_pos:start], False))
         
         # Add the code block
-        parts.append((match.group(0), True))
-        current_pos = match.end()
+        parts.append((content[start:end], True))
+        current_pos = end
     
     # Add any remaining non-code content
     if current_pos < len(content):
@@ -2,9 +2,95 @@
 
 import re
 import json
+import logging
+from functools import lru_cache
 from pathlib import Path
-from bs4 import BeautifulSoup
+from typing import List, Pattern, Tuple
 from .code_blocks import split_content_and_code_blocks
+from .utils import collapse_blank_lines
+
+log = logging.getLogger(__name__)
+
+# Schema imports and the component that renders them
+SCHEMA_IMPORT_REGEX = re.compile(r'import\s+(\w+)\s+from\s+[\'"]([^\'\"]+\.json)[\'"]')
+
+OVERVIEW_REGEX = re.compile(
+    r'<Overview\s+childPageNodes\s*=\s*{[^}]+}\s*/>\s*\n?',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# UI table components and the HTML allowed inside their cells
+TABLE_REGEX = re.compile(r'<Table[^>]*+>.*?</Table>', re.DOTALL)
+TABLE_CAPTION_REGEX = re.compile(r'caption="([^"]*)"')
+TABLE_HEAD_REGEX = re.compile(r'<TableHead>.*?<TableRow>(.*?)</TableRow>.*?</TableHead>', re.DOTALL)
+TABLE_BODY_REGEX = re.compile(r'<TableBody>(.*?)</TableBody>', re.DOTALL)
+TABLE_ROW_REGEX = re.compile(r'<TableRow[^>]*+>(.*?)</TableRow>', re.DOTALL)
+TABLE_CELL_REGEX = re.compile(r'<TableCell[^>]*+>(.*?)</TableCell>', re.DOTALL)
+HTML_LINK_REGEX = re.compile(r'<a href="([^"]++)"[^>]*+>(.*?)</a>')
+HTML_STRONG_REGEX = re.compile(r'<strong>(.*?)</strong>')
+HTML_TAG_REGEX = re.compile(r'<[^>]+>')
+
+# Card layouts. Possessive quantifiers (Python 3.11+) mark the runs that
+# never need to give characters back, which bounds backtracking on malformed markup.
+AI_CONVERSATION_REGEX = re.compile(r'<AIConversation[^>]*+>.*?</AIConversation>', re.DOTALL)
+CARD_IMPORT_REGEX = re.compile(
+    r'import\s*{\s*Card\s*}\s*from\s*[\'"]@aws-amplify/ui-react[\'"];\s*\n?',
+    re.MULTILINE
+)
+COLUMNS_REGEX = re.compile(r'<Columns\s++columns=\{(\d++)\}>\s*+([\s\S]*?)\s*</Columns>', re.DOTALL)
+CARD_REGEX = re.compile(r'<Card\s++variation="outlined">\s*+([\s\S]*?)\s*</Card>', re.DOTALL)
+CARD_LINK_REGEX = re.compile(r'\[(.*?)\]\((.*?)\)([\s\S]*)', re.DOTALL)
+FEATURE_CARD_REGEX = re.compile(
+    r'<Flex[^>]*+>\s*+<Heading[^>]*+>(.*?)</Heading>\s*+<Text>(.*?)</Text>\s*+</Flex>',
+    re.DOTALL
+)
+CARD_TEXT_REGEX = re.compile(r'<Text>(.*?)</Text>', re.DOTALL)
+
+# Protected redaction messages, keyed by generation
+PROTECTED_REDACTION_USAGE_REGEX = re.compile(r'<ProtectedRedactionGen[12]Message\s*/>')
+PROTECTED_REDACTION_COMPONENT_REGEXES = {
+    gen: re.compile(
+        rf'export\s+const\s+ProtectedRedactionGen{gen}Message\s*=\s*\(\)\s*=>\s*\(\s*'
+        r'<Callout\s+warning[^>]*>\s*([\s\S]*?)\s*</Callout>\s*\)',
+        re.DOTALL
+    )
+    for gen in ['1', '2']
+}
+PROTECTED_REDACTION_IMPORT_REGEX = re.compile(
+    r'^import\s*{\s*ProtectedRedactionGen[12]Message\s*}\s*from\s*[\'"]@/protected/ProtectedRedactionMessage[\'"].*?\n',
+    re.MULTILINE
+)
+PROTECTED_REDACTION_TAG_REGEXES = {
+    f'Gen{gen}': re.compile(rf'<ProtectedRedactionGen{gen}Message\s*/>\s*\n?', re.MULTILINE)
+    for gen in ['1', '2']
+}
+HTML_PARAGRAPH_REGEX = re.compile(r'<p>(.*?)</p>')
+HTML_CODE_REGEX = re.compile(r'<code>(.*?)</code>')
+HTML_LIST_REGEX = re.compile(r'<ul>\s*([\s\S]*?)\s*</ul>')
+HTML_LIST_ITEM_REGEX = re.compile(r'<li>(.*?)</li>')
+
+JSX_COMMENT_REGEX = re.compile(r'{/\*.*?\*/}', re.DOTALL)
+
+@lru_cache(maxsize=None)
+def _format_schema_file(path_str: str, mtime_ns: int) -> str:
+    """Read a schema file and format it as a JSON code block.
+    
+    Cached per (path, mtime) since many docs embed the same schema.
+    """
+    schema_json = json.loads(Path(path_str).read_text(encoding='utf-8'))
+    formatted_schema = json.dumps(schema_json, indent=2)
+    return f"```json\n{formatted_schema}\n```"
+
+@lru_cache(maxsize=None)
+def _schema_patterns(var_name: str, schema_path: str) -> Tuple[Pattern, Pattern]:
+    """Compile the patterns for one schema import: its JSX embedding and the import itself."""
+    embed_pattern = re.compile(
+        r'<pre><code[^>]*+>\s*+{JSON\.stringify\(' + var_name + r'[^}]++}\s*+</code></pre>'
+    )
+    import_pattern = re.compile(
+        r'import\s+' + var_name + r'\s+from\s+[\'"]' + re.escape(schema_path) + r'[\'"];\s*\n?'
+    )
+    return embed_pattern, import_pattern
 
 def embed_schema(content: str, file_path: Path) -> str:
     """Embed JSON schema from an imported file into the markdown content.
@@ -29,9 +115,12 @@ def embed_schema(content: str, file_path: Path) -> str:
         >>> '```json\\n{\\n  "foo": "bar"\\n}\\n```' in result
         True
     """
+    # Schema imports all end in .json
+    if '.json' not in content:
+        return content
+    
     # Find schema imports
-    schema_import_pattern = re.compile(r'import\s+(\w+)\s+from\s+[\'"]([^\'\"]+\.json)[\'"]')
-    matches = schema_import_pattern.finditer(content)
+    matches = SCHEMA_IMPORT_REGEX.finditer(content)
     
     for match in matches:
         var_name = match.group(1)
@@ -39,30 +128,24 @@ def embed_schema(content: str, file_path: Path) -> str:
         
         # Resolve the schema path relative to the file
         schema_file = file_path.parent / schema_path
-        if not schema_file.exists():
+        try:
+            mtime_ns = schema_file.stat().st_mtime_ns
+        except OSError:
             continue
             
         try:
-            # Read and parse the schema
-            schema_content = schema_file.read_text(encoding='utf-8')
-            schema_json = json.loads(schema_content)
-            formatted_schema = json.dumps(schema_json, indent=2)
-            
-            # Create markdown code block
-            schema_block = f"```json\n{formatted_schema}\n```"
+            # Read, parse and format the schema as a markdown code block
+            schema_block = _format_schema_file(str(schema_file), mtime_ns)
+            embed_pattern, import_pattern = _schema_patterns(var_name, schema_path)
             
             # Replace the JSX-style schema embedding with markdown
-            content = re.sub(
-                r'<pre><code[^>]*>\s*{JSON\.stringify\(' + var_name + r'[^}]+}\s*</code></pre>',
-                schema_block,
-                content
-            )
+            content = embed_pattern.sub(schema_block, content)
             
             # Remove the schema import
-            content = re.sub(r'import\s+' + var_name + r'\s+from\s+[\'"]' + re.escape(schema_path) + r'[\'"];\s*\n?', '', content)
+            content = import_pattern.sub('', content)
             
         except Exception as e:
-            print(f"Error processing schema file {schema_file}: {e}")
+            log.error("Error processing schema file %s: %s", schema_file, e)
             
     return content
 
@@ -80,12 +163,10 @@ def remove_overview_components(content: str) -> str:
         >>> remove_overview_components(content)
         'Other content'
     """
-    return re.sub(
-        r'<Overview\s+childPageNodes\s*=\s*{[^}]+}\s*/>\s*\n?',
-        '',
-        content,
-        flags=re.IGNORECASE | re.MULTILINE
-    )
+    # The pattern is case-insensitive, so check the lowercased text
+    if '<overview' not in content.lower():
+        return content
+    return OVERVIEW_REGEX.sub('', content)
 
 def convert_ui_table_to_markdown(content: str) -> str:
     """Convert @aws-amplify/ui-react Table components to markdown tables.
@@ -117,40 +198,31 @@ def convert_ui_table_to_markdown(content: str) -> str:
         >>> '| Data |' in result
         True
     """
-    # First find all Table components
-    table_pattern = re.compile(
-        r'<Table[^>]*>.*?</Table>',
-        re.DOTALL
-    )
+    if '<Table' not in content:
+        return content
     
-    def process_table(table_match: str) -> str:
+    def process_table(match: re.Match) -> str:
+        table_match = match.group(0)
+        
         # Extract caption if present
         caption = ''
-        caption_match = re.search(r'caption="([^"]*)"', table_match)
+        caption_match = TABLE_CAPTION_REGEX.search(table_match)
         if caption_match:
             caption = caption_match.group(1)
         
         # Process header
-        header_pattern = re.compile(
-            r'<TableHead>.*?<TableRow>(.*?)</TableRow>.*?</TableHead>',
-            re.DOTALL
-        )
-        header_match = header_pattern.search(table_match)
+        header_match = TABLE_HEAD_REGEX.search(table_match)
         if not header_match:
             return table_match  # Return original if no header found
             
         # Extract header cells
         header_cells = []
-        for cell in re.finditer(r'<TableCell[^>]*>(.*?)</TableCell>', header_match.group(1), re.DOTALL):
+        for cell in TABLE_CELL_REGEX.finditer(header_match.group(1)):
             cell_content = cell.group(1).strip()
             header_cells.append(cell_content)
             
         # Process body
-        body_pattern = re.compile(
-            r'<TableBody>(.*?)</TableBody>',
-            re.DOTALL
-        )
-        body_match = body_pattern.search(table_match)
+        body_match = TABLE_BODY_REGEX.search(table_match)
         if not body_match:
             return table_match  # Return original if no body found
             
@@ -166,28 +238,21 @@ def convert_ui_table_to_markdown(content: str) -> str:
         markdown_rows.append('|' + '---|' * len(header_cells))
         
         # Process each row in body
-        row_pattern = re.compile(r'<TableRow[^>]*>(.*?)</TableRow>', re.DOTALL)
-        for row_match in row_pattern.finditer(body_match.group(1)):
+        for row_match in TABLE_ROW_REGEX.finditer(body_match.group(1)):
             row_cells = []
-            for cell in re.finditer(r'<TableCell[^>]*>(.*?)</TableCell>', row_match.group(1), re.DOTALL):
+            for cell in TABLE_CELL_REGEX.finditer(row_match.group(1)):
                 cell_content = cell.group(1)
                 
-                # Handle links
-                cell_content = re.sub(
-                    r'<a href="([^"]+)"[^>]*>(.*?)</a>',
-                    r'[\2](\1)',
-                    cell_content
-                )
-                
-                # Handle strong tags
-                cell_content = re.sub(
-                    r'<strong>(.*?)</strong>',
-                    r'**\1**',
-                    cell_content
-                )
-                
-                # Clean up any remaining HTML-like tags
-                cell_content = re.sub(r'<[^>]+>', '', cell_content)
+                # Plain-text cells have no tags to rewrite
+                if '<' in cell_content:
+                    # Handle links
+                    cell_content = HTML_LINK_REGEX.sub(r'[\2](\1)', cell_content)
+                    
+                    # Handle strong tags
+                    cell_content = HTML_STRONG_REGEX.sub(r'**\1**', cell_content)
+                    
+                    # Clean up any remaining HTML-like tags
+                    cell_content = HTML_TAG_REGEX.sub('', cell_content)
                 cell_content = cell_content.strip()
                 row_cells.append(cell_content)
                 
@@ -196,7 +261,7 @@ def convert_ui_table_to_markdown(content: str) -> str:
         return '\n'.join(markdown_rows)
     
     # Replace each table with its markdown equivalent
-    return table_pattern.sub(lambda m: process_table(m.group(0)), content)
+    return TABLE_REGEX.sub(process_table, content)
 
 def convert_cards_to_markdown(content: str) -> str:
     """Convert Card components to markdown format with frontmatter.
@@ -222,17 +287,15 @@ def convert_cards_to_markdown(content: str) -> str:
         >>> '> Description' in result
         True
     """
-    # First check if we're inside an AIConversation component
-    ai_conversation_pattern = re.compile(
-        r'<AIConversation[^>]*>.*?</AIConversation>',
-        re.DOTALL
-    )
+    # Nothing to do without cards, column layouts or the Card import
+    if 'Card' not in content and '<Columns' not in content:
+        return content
     
     # Split content into AIConversation and non-AIConversation parts
     parts = []
     last_end = 0
     
-    for match in ai_conversation_pattern.finditer(content):
+    for match in AI_CONVERSATION_REGEX.finditer(content):
         # Add non-AIConversation content before this match
         if match.start() > last_end:
             parts.append((content[last_end:match.start()], False))
@@ -256,34 +319,18 @@ def convert_cards_to_markdown(content: str) -> str:
             processed = part_content
             
             # Remove the Card import
-            processed = re.sub(
-                r'import\s*{\s*Card\s*}\s*from\s*[\'"]@aws-amplify/ui-react[\'"];\s*\n?',
-                '',
-                processed,
-                flags=re.MULTILINE
-            )
+            processed = CARD_IMPORT_REGEX.sub('', processed)
             
             # Handle column layouts first (outer wrapper)
-            columns_pattern = re.compile(
-                r'<Columns\s+columns=\{(\d+)\}>\s*([\s\S]*?)\s*</Columns>',
-                re.DOTALL
-            )
-            
             def process_columns(match: str) -> str:
                 columns_content = match.group(2).strip()
                 
                 # Process any cards within the columns
-                card_pattern = re.compile(
-                    r'<Card\s+variation="outlined">\s*([\s\S]*?)\s*</Card>',
-                    re.DOTALL
-                )
-                
                 def process_card(card_match: str) -> str:
                     card_content = card_match.group(1).strip()
                     
                     # Check for link pattern (Simple Link Cards)
-                    link_pattern = re.compile(r'\[(.*?)\]\((.*?)\)([\s\S]*)', re.DOTALL)
-                    link_match = link_pattern.search(card_content)
+                    link_match = CARD_LINK_REGEX.search(card_content)
                     
                     if link_match:
                         title = link_match.group(1).strip()
@@ -294,27 +341,18 @@ def convert_cards_to_markdown(content: str) -> str:
                     # If no pattern matches, preserve as is
                     return f"> {card_content}"
                 
-                processed_content = card_pattern.sub(lambda m: process_card(m), columns_content)
+                processed_content = CARD_REGEX.sub(lambda m: process_card(m), columns_content)
                 return processed_content
             
             # Process columns first
-            processed = columns_pattern.sub(process_columns, processed)
+            processed = COLUMNS_REGEX.sub(process_columns, processed)
             
             # Then process any remaining cards outside columns
-            card_pattern = re.compile(
-                r'<Card\s+variation="outlined">\s*([\s\S]*?)\s*</Card>',
-                re.DOTALL
-            )
-            
             def process_remaining_card(match: str) -> str:
                 card_content = match.group(1).strip()
                 
                 # Check for Feature Cards pattern
-                feature_pattern = re.compile(
-                    r'<Flex[^>]*>\s*<Heading[^>]*>(.*?)</Heading>\s*<Text>(.*?)</Text>\s*</Flex>',
-                    re.DOTALL
-                )
-                feature_match = feature_pattern.search(card_content)
+                feature_match = FEATURE_CARD_REGEX.search(card_content)
                 
                 if feature_match:
                     title = feature_match.group(1).strip()
@@ -322,8 +360,7 @@ def convert_cards_to_markdown(content: str) -> str:
                     return f"> ### {title}\n>\n> {description}"
                 
                 # Check for Welcome Message Cards
-                text_pattern = re.compile(r'<Text>(.*?)</Text>', re.DOTALL)
-                text_match = text_pattern.search(card_content)
+                text_match = CARD_TEXT_REGEX.search(card_content)
                 
                 if text_match:
                     content = text_match.group(1).strip()
@@ -332,7 +369,7 @@ def convert_cards_to_markdown(content: str) -> str:
                 # If no pattern matches, preserve as is
                 return f"> {card_content}"
             
-            processed = card_pattern.sub(process_remaining_card, processed)
+            processed = CARD_REGEX.sub(process_remaining_card, processed)
             result.append(processed)
     
     return ''.join(result)
@@ -348,7 +385,7 @@ def embed_protected_redaction_message(content: str, workspace_root: Path) -> str
         The content with protected redaction messages embedded as markdown
     """
     # First check if we need to process any redaction messages
-    if not re.search(r'<ProtectedRedactionGen[12]Message\s*/>', content):
+    if 'ProtectedRedaction' not in content or not PROTECTED_REDACTION_USAGE_REGEX.search(content):
         return content
 
     # Try to read the message component file
@@ -362,31 +399,26 @@ def embed_protected_redaction_message(content: str, workspace_root: Path) -> str
         
         # Extract Gen1 and Gen2 message components
         message_components = {}
-        for gen in ['1', '2']:
-            component_pattern = re.compile(
-                rf'export\s+const\s+ProtectedRedactionGen{gen}Message\s*=\s*\(\)\s*=>\s*\(\s*'
-                r'<Callout\s+warning[^>]*>\s*([\s\S]*?)\s*</Callout>\s*\)',
-                re.DOTALL
-            )
+        for gen, component_pattern in PROTECTED_REDACTION_COMPONENT_REGEXES.items():
             match = component_pattern.search(message_content)
             if match:
                 # Extract the content and convert to markdown
                 callout_content = match.group(1)
                 
                 # Convert paragraph tags to newlines
-                md_content = re.sub(r'<p>(.*?)</p>', r'\1\n', callout_content)
+                md_content = HTML_PARAGRAPH_REGEX.sub(r'\1\n', callout_content)
                 
                 # Convert code tags
-                md_content = re.sub(r'<code>(.*?)</code>', r'`\1`', md_content)
+                md_content = HTML_CODE_REGEX.sub(r'`\1`', md_content)
                 
                 # Convert list items
-                md_content = re.sub(r'<ul>\s*([\s\S]*?)\s*</ul>', lambda m: '\n' + re.sub(r'<li>(.*?)</li>', r'- \1', m.group(1)), md_content)
+                md_content = HTML_LIST_REGEX.sub(lambda m: '\n' + HTML_LIST_ITEM_REGEX.sub(r'- \1', m.group(1)), md_content)
                 
                 # Clean up any remaining HTML tags
-                md_content = re.sub(r'<[^>]+>', '', md_content)
+                md_content = HTML_TAG_REGEX.sub('', md_content)
                 
                 # Clean up whitespace and empty lines
-                md_content = re.sub(r'\n\s*\n\s*\n', '\n\n', md_content)
+                md_content = collapse_blank_lines(md_content)
                 md_content = md_content.strip()
                 
                 # Format as GitHub-flavored markdown warning with proper quoting
@@ -397,26 +429,16 @@ def embed_protected_redaction_message(content: str, workspace_root: Path) -> str
                 message_components[f'Gen{gen}'] = formatted_message
         
         # First remove the imports
-        content = re.sub(
-            r'^import\s*{\s*ProtectedRedactionGen[12]Message\s*}\s*from\s*[\'"]@/protected/ProtectedRedactionMessage[\'"].*?\n',
-            '',
-            content,
-            flags=re.MULTILINE
-        )
+        content = PROTECTED_REDACTION_IMPORT_REGEX.sub('', content)
         
         # Then replace each component usage with its markdown
         for gen, message in message_components.items():
-            content = re.sub(
-                rf'<ProtectedRedaction{gen}Message\s*/>\s*\n?',
-                message,
-                content,
-                flags=re.MULTILINE
-            )
+            content = PROTECTED_REDACTION_TAG_REGEXES[gen].sub(message, content)
         
         return content
             
     except Exception as e:
-        print(f"Error processing protected redaction messages: {e}")
+        log.error("Error processing protected redaction messages: %s", e)
         return content 
 
 def remove_jsx_comments(content: str) -> str:
@@ -433,15 +455,37 @@ def remove_jsx_comments(content: str) -> str:
         >>> remove_jsx_comments(content)
         'Some text\nMore text'
     """
-    parts = split_content_and_code_blocks(content)
+    parts = remove_jsx_comments_parts(split_content_and_code_blocks(content))
+    return ''.join(part for part, _ in parts)
+
+def remove_jsx_comments_parts(parts: List[Tuple[str, bool]]) -> List[Tuple[str, bool]]:
+    """Remove JSX-style comments from content that is already split into code blocks.
+    
+    Lets callers that go on to split the result again reuse the parts
+    instead. Joining the returned parts gives the same text as
+    remove_jsx_comments.
+    
+    Args:
+        parts: Output of split_content_and_code_blocks
+        
+    Returns:
+        The parts with JSX comments removed from the non-code parts, and
+        the whole text stripped of leading and trailing whitespace
+    """
     result = []
     
     for part, is_code_block in parts:
         if not is_code_block:
             # Remove JSX comments outside code blocks
-            part = re.sub(r'{/\*.*?\*/}', '', part, flags=re.DOTALL)
+            part = JSX_COMMENT_REGEX.sub('', part)
             # Clean up empty lines
-            part = re.sub(r'\n\s*\n\s*\n', '\n\n', part)
-        result.append(part)
+            part = collapse_blank_lines(part)
+        result.append((part, is_code_block))
+    
+    # Code blocks start and end with backticks, so stripping the text
+    # only ever touches the first and last parts
+    if result:
+        result[0] = (result[0][0].lstrip(), result[0][1])
+        result[-1] = (result[-1][0].rstrip(), result[-1][1])
     
-    return ''.join(result).strip() 
+    return result
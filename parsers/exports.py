@@ -1,6 +1,43 @@
 """Functions for handling export statements in markdown/MDX content."""
 
 import re
+from typing import Dict
+
+from .utils import collapse_blank_lines
+
+# Start of a getStaticPaths/getStaticProps export, up to its opening brace
+EXPORT_START_REGEX = re.compile(
+    r'^export\s+(?:'
+    r'const\s+(?:getStaticPaths|getStaticProps)|'
+    r'(?:async\s+)?function\s+(?:getStaticPaths|getStaticProps)'
+    r')(?:\s*=\s*(?:async\s+)?\([^)]*\)\s*=>)?\s*(?:\([^)]*\))?\s*{',
+    re.MULTILINE
+)
+
+BRACE_REGEX = re.compile(r'[{}]')
+
+def find_brace_pairs(text: str) -> Dict[int, int]:
+    """Match every opening brace in the text to its closing brace.
+    
+    Args:
+        text: The text to scan
+        
+    Returns:
+        Dict mapping the position of each matched '{' to the position of
+        its '}'. Unmatched braces are left out.
+        
+    Example:
+        >>> find_brace_pairs('a { b { c } } }')
+        {6: 10, 2: 12}
+    """
+    pairs = {}
+    stack = []
+    for match in BRACE_REGEX.finditer(text):
+        if match.group() == '{':
+            stack.append(match.start())
+        elif stack:
+            pairs[stack.pop()] = match.start()
+    return pairs
 
 def remove_nextjs_exports(content: str) -> str:
     """Remove Next.js-specific exports from the content.
@@ -27,44 +64,14 @@ def remove_nextjs_exports(content: str) -> str:
         >>> 'Other content' in result
         True
     """
-    def find_matching_brace(text: str, start: int) -> int:
-        """Find the matching closing brace, handling nested braces.
-        
-        Args:
-            text: The text to search in
-            start: The position of the opening brace
-            
-        Returns:
-            The position of the matching closing brace, or -1 if not found
-        """
-        stack = []
-        i = start
-        while i < len(text):
-            if text[i] == '{':
-                stack.append(i)
-            elif text[i] == '}':
-                if stack:
-                    stack.pop()
-                    if not stack:  # Found the matching brace
-                        return i
-            i += 1
-        return -1
-
-    # Pattern to find the start of export blocks
-    export_start_pattern = re.compile(
-        r'^export\s+(?:'
-        r'const\s+(?:getStaticPaths|getStaticProps)|'
-        r'(?:async\s+)?function\s+(?:getStaticPaths|getStaticProps)'
-        r')(?:\s*=\s*(?:async\s+)?\([^)]*\)\s*=>)?\s*(?:\([^)]*\))?\s*{',
-        re.MULTILINE
-    )
-
     result = []
     last_end = 0
+    # Braces are paired in one pass over the whole content, on the first export found
+    brace_pairs = None
     
     while True:
         # Find next export block start
-        match = export_start_pattern.search(content, last_end)
+        match = EXPORT_START_REGEX.search(content, last_end)
         if not match:
             break
             
@@ -72,7 +79,9 @@ def remove_nextjs_exports(content: str) -> str:
         brace_start = match.end() - 1  # Position of the opening brace
         
         # Find matching closing brace
-        end_pos = find_matching_brace(content, brace_start)
+        if brace_pairs is None:
+            brace_pairs = find_brace_pairs(content)
+        end_pos = brace_pairs.get(brace_start, -1)
         if end_pos == -1:
             break
             
@@ -91,6 +100,6 @@ def remove_nextjs_exports(content: str) -> str:
     
     # Clean up multiple empty lines
     result = ''.join(result)
-    result = re.sub(r'\n\s*\n\s*\n', '\n\n', result)
+    result = collapse_blank_lines(result)
     
     return result 
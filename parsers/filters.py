@@ -1,58 +1,32 @@
 """Functions for handling InlineFilter tags in markdown/MDX content."""
 
 import re
-from typing import List, Tuple
+from bisect import bisect_left
+from functools import lru_cache
+from typing import FrozenSet
 
-from .code_blocks import split_content_and_code_blocks
+from .utils import collapse_blank_lines
 
-def find_matching_filter_end(text: str, start: int) -> int:
-    """Find the matching closing InlineFilter tag, handling nested filters.
-    
-    Args:
-        text: The text to search in
-        start: The position of the opening tag
-        
-    Returns:
-        The position of the matching closing tag, or -1 if not found
-    """
-    stack = []
-    i = start
-    in_quotes = False
-    quote_char = None
-    
-    # Push the initial opening tag onto the stack
-    stack.append(start)
+# Quoted platform names inside a filters={[...]} attribute
+FILTER_PLATFORM_REGEX = re.compile(r'["\']([a-zA-Z0-9-]+)["\']')
+
+# Opening and closing InlineFilter tags, in any case
+FILTER_TAG_REGEX = re.compile(r'<inlinefilter|</inlinefilter>', re.IGNORECASE)
+
+# Start of the filters attribute inside an opening tag
+FILTERS_ATTR_REGEX = re.compile(r'filters=', re.IGNORECASE)
+
+@lru_cache(maxsize=4096)
+def _parse_filters(platforms_str: str) -> FrozenSet[str]:
+    """Parse the platform names out of a raw filters={[...]} attribute.
     
-    while i < len(text):
-        # Skip over quoted sections
-        if text[i] in ['"', "'"] and (i == 0 or text[i-1] != '\\'):
-            if not in_quotes:
-                in_quotes = True
-                quote_char = text[i]
-            elif text[i] == quote_char:
-                in_quotes = False
-                quote_char = None
-        
-        if not in_quotes:
-            # Look for opening tags
-            if i + len('<inlinefilter') <= len(text):
-                next_chunk = text[i:i+len('<inlinefilter')].lower()
-                if next_chunk == '<inlinefilter':
-                    stack.append(i)
-                    i += len('<inlinefilter') - 1
-            
-            # Look for closing tags
-            elif i + len('</inlinefilter>') <= len(text):
-                next_chunk = text[i:i+len('</inlinefilter>')].lower()
-                if next_chunk == '</inlinefilter':
-                    stack.pop()
-                    if not stack:  # Found the matching end tag
-                        return i
-                    i += len('</inlinefilter') - 1
-        
-        i += 1
+    Cached per attribute value since the same filter lists repeat across docs.
     
-    return -1
+    Example:
+        >>> sorted(_parse_filters('filters={["react", "vue"]}'))
+        ['react', 'vue']
+    """
+    return frozenset(FILTER_PLATFORM_REGEX.findall(platforms_str))
 
 def process_inline_filters(content: str, current_platform: str) -> str:
     """Process InlineFilter blocks in MDX content using regex.
@@ -84,112 +58,114 @@ def process_inline_filters(content: str, current_platform: str) -> str:
         >>> 'Common content' in result
         True
     """
-    def find_matching_end(text: str, start: int) -> int:
+    # Tokenize every tag once as (start, end, is_close); the walk below only
+    # uses this list instead of searching the text again. Matching is
+    # case-insensitive in place, so no lowercased copy of the content is made.
+    tags = [
+        (m.start(), m.end(), m.group().startswith('</'))
+        for m in FILTER_TAG_REGEX.finditer(content)
+    ]
+    
+    # Most pages have no filters; they only get the whitespace cleanup
+    if not tags:
+        return collapse_blank_lines(content.strip()).strip()
+    
+    tag_starts = [tag_start for tag_start, _, _ in tags]
+    
+    def find_next_open(start: int, end: int) -> int:
+        """Find the next opening tag inside content[start:end], or -1."""
+        for i in range(bisect_left(tag_starts, start), len(tags)):
+            tag_start, tag_end, is_close = tags[i]
+            if tag_end > end:
+                break
+            if not is_close:
+                return tag_start
+        return -1
+    
+    def find_matching_end(start: int, end: int) -> int:
         """Find the matching closing InlineFilter tag, handling nested tags."""
         count = 1  # We start after an opening tag
-        pos = start
         
-        while count > 0 and pos < len(text):
-            # Find next opening or closing tag (case insensitive)
-            open_tag = -1
-            close_tag = -1
-            
-            # Look for next tags after current position
-            text_lower = text.lower()
-            temp_pos = pos
-            while temp_pos < len(text):
-                next_open = text_lower.find('<inlinefilter', temp_pos)
-                next_close = text_lower.find('</inlinefilter>', temp_pos)
-                
-                if next_open == -1 and next_close == -1:
-                    break
-                    
-                if next_open != -1 and (next_close == -1 or next_open < next_close):
-                    open_tag = next_open
-                    temp_pos = next_open + len('<inlinefilter')
-                    break
-                    
-                if next_close != -1:
-                    close_tag = next_close
-                    temp_pos = next_close + len('</inlinefilter>')
-                    break
-            
-            # No more tags found
-            if open_tag == -1 and close_tag == -1:
-                return -1
-                
-            # Found a closing tag first
-            if (close_tag != -1 and open_tag == -1) or (close_tag != -1 and close_tag < open_tag):
+        for i in range(bisect_left(tag_starts, start), len(tags)):
+            tag_start, tag_end, is_close = tags[i]
+            # Tags don't overlap, so nothing after this fits either
+            if tag_end > end:
+                break
+            if is_close:
                 count -= 1
-                pos = close_tag + len('</inlinefilter>')
-            # Found an opening tag first
-            elif open_tag != -1:
+                if count == 0:
+                    return tag_end
+            else:
                 count += 1
-                pos = open_tag + len('<inlinefilter')
         
-        return pos if count == 0 else -1
+        # No matching closing tag
+        return -1
+    
+    # Walk the filters with an explicit stack of frames instead of recursing.
+    # Each frame is [pos, end, parts]: the next offset to scan, the end of its
+    # span and the pieces kept so far. An included filter body pushes a new
+    # frame; when a frame finishes, its stripped text joins the parent's parts.
+    stack = [[0, len(content), []]]
     
-    def process_recursive(text: str, depth: int = 0) -> str:
-        result = []
-        pos = 0
+    while True:
+        frame = stack[-1]
+        pos, end, parts = frame
         
-        while pos < len(text):
+        if pos < end:
             # Find next InlineFilter start (case insensitive)
-            start_tag = text.lower().find('<inlinefilter', pos)
-            if start_tag == -1:
-                # No more filters, add remaining content
-                result.append(text[pos:])
-                break
-            
-            # Add content up to the tag
-            result.append(text[pos:start_tag])
-            
-            # Find the filters attribute
-            filters_start = text.lower().find('filters=', start_tag)
-            if filters_start == -1:
-                pos = start_tag + 1
-                continue
+            start_tag = find_next_open(pos, end)
+            if start_tag != -1:
+                # Add content up to the tag
+                parts.append(content[pos:start_tag])
                 
-            # Find the end of the opening tag
-            tag_end = text.find('>', filters_start)
-            if tag_end == -1:
-                pos = start_tag + 1
-                continue
+                # Find the filters attribute
+                filters_match = FILTERS_ATTR_REGEX.search(content, start_tag, end)
+                if filters_match is None:
+                    frame[0] = start_tag + 1
+                    continue
+                filters_start = filters_match.start()
+                    
+                # Find the end of the opening tag
+                tag_end = content.find('>', filters_start, end)
+                if tag_end == -1:
+                    frame[0] = start_tag + 1
+                    continue
+                    
+                # Extract platforms string
+                platforms_str = content[filters_start:tag_end]
+                platforms = _parse_filters(platforms_str)
                 
-            # Extract platforms string
-            platforms_str = text[filters_start:tag_end]
-            platforms = re.findall(r'["\']([a-zA-Z0-9-]+)["\']', platforms_str)
-            
-            # Find the matching end tag
-            content_start = tag_end + 1
-            content_end = find_matching_end(text, content_start)
-            
-            if content_end == -1:
-                pos = start_tag + 1
+                # Find the matching end tag
+                content_start = tag_end + 1
+                content_end = find_matching_end(content_start, end)
+                
+                if content_end == -1:
+                    frame[0] = start_tag + 1
+                    continue
+                
+                # Move past this entire block
+                frame[0] = content_end
+                
+                # Include content if either:
+                # 1. No platforms specified (empty filter) - include for all platforms
+                # 2. Current platform is in the specified platforms set
+                if not platforms or current_platform in platforms:
+                    # Process any nested filters between the tags in a new frame
+                    stack.append([content_start, content_end - len('</inlinefilter>'), []])
                 continue
             
-            # Get the content between tags
-            inner_content = text[content_start:content_end - len('</inlinefilter>')]
-            
-            # Include content if either:
-            # 1. No platforms specified (empty filter) - include for all platforms
-            # 2. Current platform is in the specified platforms list
-            should_include = not platforms or current_platform in platforms
-            
-            if should_include:
-                # Recursively process any nested filters
-                processed_content = process_recursive(inner_content, depth + 1)
-                result.append(processed_content)
-            
-            # Move past this entire block
-            pos = content_end
+            # No more filters, add remaining content
+            parts.append(content[pos:end])
         
-        return ''.join(result).strip()
-    
-    # Process the content recursively
-    result = process_recursive(content)
+        # This frame is done; hand its text to the parent
+        stack.pop()
+        text = ''.join(parts).strip()
+        if not stack:
+            result = text
+            break
+        stack[-1][2].append(text)
     
     # Clean up multiple empty lines
-    result = re.sub(r'\n\s*\n\s*\n', '\n\n', result)
+    result = collapse_blank_lines(result)
     
     return result.strip() 
@@ -1,8 +1,10 @@
 """Functions for handling fragment imports and processing in MDX content."""
 
+import os
 import re
+import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
 
 from .code_blocks import split_content_and_code_blocks
 from .filters import process_inline_filters
@@ -11,10 +13,85 @@ from .components import (
     embed_protected_redaction_message,
     convert_ui_table_to_markdown,
     convert_cards_to_markdown,
-    remove_jsx_comments,
+    remove_jsx_comments_parts,
     remove_overview_components
 )
 
+log = logging.getLogger(__name__)
+
+# Default imports, possibly inside a code block, collected as fragment aliases
+FRAGMENT_IMPORT_REGEX = re.compile(
+    r'(?:^|\n|```.*?\n)(?:\s*)(import\s+([a-zA-Z0-9_]+)\s+from\s+[\'"](?:/)?([^\'\"]+)[\'"]\s*;\s*\n?)',
+    re.MULTILINE | re.DOTALL
+)
+
+FRAGMENTS_REGEX = re.compile(
+    r'<Fragments\s+fragments\s*=\s*({[\s\S]*?})\s*/>\s*\n?',
+    re.MULTILINE
+)
+
+# platform: alias entries of a fragments={...} object
+FRAGMENT_MAPPING_REGEX = re.compile(r'[\'"]?([\w-]+)[\'"]?\s*:\s*(\w+)')
+
+# Blank lines needed before and after headings in inlined fragments
+HEADING_BEFORE_REGEX = re.compile(r'([^\n])\n(\#{1,6}\s+[^\n]+)')
+HEADING_AFTER_REGEX = re.compile(r'(\#{1,6}\s+[^\n]+)\n([^\n])')
+
+# Default imports removed from the non-code sections of the output
+DEFAULT_IMPORT_REGEX = re.compile(
+    r'^\s*import\s+[a-zA-Z0-9_]+\s+from\s+[\'"](?:/)?[^\'\"]+[\'"]\s*;\s*\n?',
+    re.MULTILINE
+)
+
+EXTRA_NEWLINES_REGEX = re.compile(r'\n{3,}')
+
+# (path, platform) of the fragments currently being expanded, to catch cycles
+_FRAGMENTS_IN_PROGRESS = set()
+
+@lru_cache(maxsize=4096)
+def _read_and_process_fragment(path_str: str, mtime_ns: int, platform: str, workspace_root_str: str) -> str:
+    """Read a fragment file and process it for inlining on one platform.
+    
+    Cached per (path, mtime, platform) since the same fragment is pulled
+    into many docs for each platform. Callers pass an absolute, normalized
+    path so relative and /src/... imports of one fragment share an entry.
+    
+    Raises:
+        ValueError: If the fragment ends up including itself
+    """
+    fragment_path = Path(path_str)
+    
+    # Read and process the fragment file
+    fragment_content = fragment_path.read_text(encoding='utf-8')
+    
+    # Process any nested fragments in the fragment. Nested fragments go
+    # through this cache too, so each is expanded once per platform.
+    key = (path_str, platform)
+    if key in _FRAGMENTS_IN_PROGRESS:
+        raise ValueError(f"Fragment includes itself: {path_str}")
+    _FRAGMENTS_IN_PROGRESS.add(key)
+    try:
+        fragment_content = process_fragments(
+            fragment_content, 
+            fragment_path, 
+            platform,
+            Path(workspace_root_str)
+        )
+    finally:
+        _FRAGMENTS_IN_PROGRESS.discard(key)
+    
+    # Process any inline filters in the fragment
+    fragment_content = process_inline_filters(fragment_content, platform)
+    
+    # Ensure proper spacing around headings
+    # First ensure there's a newline before any heading
+    fragment_content = HEADING_BEFORE_REGEX.sub(r'\1\n\n\2', fragment_content)
+    # Then ensure there's a newline after any heading
+    fragment_content = HEADING_AFTER_REGEX.sub(r'\1\n\n\2', fragment_content)
+    
+    # Add newlines to ensure proper separation between fragments
+    return "\n\n" + fragment_content.strip() + "\n\n"
+
 def process_fragments(content: str, file_path: Path, platform: str, workspace_root: Path) -> str:
     """Process fragment imports and components in MDX content.
     
@@ -53,29 +130,29 @@ def process_fragments(content: str, file_path: Path, platform: str, workspace_ro
     # Remove Overview components
     content = remove_overview_components(content)
     
-    # Remove JSX comments
-    content = remove_jsx_comments(content)
+    # Remove JSX comments, keeping the code block split for the sections below
+    sections = remove_jsx_comments_parts(split_content_and_code_blocks(content))
+    content = ''.join(section for section, _ in sections)
     
     # Track imported fragments - collect ALL imports first
     fragment_imports = {}
-    import_pattern = re.compile(
-        r'(?:^|\n|```.*?\n)(?:\s*)(import\s+([a-zA-Z0-9_]+)\s+from\s+[\'"](?:/)?([^\'\"]+)[\'"]\s*;\s*\n?)',
-        re.MULTILINE | re.DOTALL
-    )
     
-    # First pass: collect all imports without removing them
-    for match in import_pattern.finditer(content):
-        alias = match.group(2)
-        source_path = match.group(3)
-        if source_path.startswith('/'):
-            fragment_imports[alias] = workspace_root / source_path.lstrip('/')
-        elif source_path.startswith('src/'):
-            fragment_imports[alias] = workspace_root / source_path
-        else:
-            fragment_imports[alias] = file_path.parent / source_path
+    # Imports are only looked up when expanding a Fragments component
+    has_fragments = '<Fragments' in content
     
-    # Split content into sections to preserve code blocks
-    sections = split_content_and_code_blocks(content)
+    # First pass: collect all imports without removing them
+    if has_fragments:
+        for match in FRAGMENT_IMPORT_REGEX.finditer(content):
+            alias = match.group(2)
+            source_path = match.group(3)
+            if source_path.startswith('/'):
+                fragment_imports[alias] = workspace_root / source_path.lstrip('/')
+            elif source_path.startswith('src/'):
+                fragment_imports[alias] = workspace_root / source_path
+            else:
+                fragment_imports[alias] = file_path.parent / source_path
+    
+    # Sections were split above to preserve code blocks
     processed_sections = []
     
     # Process each section
@@ -85,59 +162,39 @@ def process_fragments(content: str, file_path: Path, platform: str, workspace_ro
             continue
         
         # Process Fragments components in non-code sections
-        fragments_pattern = re.compile(
-            r'<Fragments\s+fragments\s*=\s*({[\s\S]*?})\s*/>\s*\n?',
-            re.MULTILINE
-        )
-        
         def fragments_repl(match):
             fragments_str = match.group(1)
             
-            # Extract platform to alias mapping using regex
-            mapping_pattern = re.compile(r'[\'"]?([\w-]+)[\'"]?\s*:\s*(\w+)')
-            mappings = mapping_pattern.findall(fragments_str)
-            
-            # Find the matching fragment for current platform
+            # Find the matching fragment for current platform, stopping at
+            # the first usable platform: alias entry
             fragment_path = None
-            fragment_content = ''
             
-            for frag_platform, alias in mappings:
+            for mapping in FRAGMENT_MAPPING_REGEX.finditer(fragments_str):
+                frag_platform, alias = mapping.groups()
                 if frag_platform == platform and alias in fragment_imports:
                     fragment_path = fragment_imports[alias]
                     break
             
-            if fragment_path and fragment_path.exists():
+            if fragment_path:
+                # A missing fragment is dropped silently
                 try:
-                    # Read and process the fragment file
-                    fragment_content = fragment_path.read_text(encoding='utf-8')
-                    
-                    # Process any nested fragments in the fragment
-                    fragment_content = process_fragments(
-                        fragment_content, 
-                        fragment_path, 
-                        platform,
-                        workspace_root
+                    mtime_ns = fragment_path.stat().st_mtime_ns
+                except OSError:
+                    return ''
+                
+                try:
+                    return _read_and_process_fragment(
+                        os.path.abspath(fragment_path), mtime_ns, platform, str(workspace_root)
                     )
-                    
-                    # Process any inline filters in the fragment
-                    fragment_content = process_inline_filters(fragment_content, platform)
-                    
-                    # Ensure proper spacing around headings
-                    # First ensure there's a newline before any heading
-                    fragment_content = re.sub(r'([^\n])\n(\#{1,6}\s+[^\n]+)', r'\1\n\n\2', fragment_content)
-                    # Then ensure there's a newline after any heading
-                    fragment_content = re.sub(r'(\#{1,6}\s+[^\n]+)\n([^\n])', r'\1\n\n\2', fragment_content)
-                    
-                    # Add newlines to ensure proper separation between fragments
-                    return "\n\n" + fragment_content.strip() + "\n\n"
                 except Exception as e:
-                    print(f"Error processing fragment {fragment_path}: {e}")
+                    log.error("Error processing fragment %s: %s", fragment_path, e)
                     return ''
             
             return ''
         
         # Process fragments first
-        section_content = fragments_pattern.sub(fragments_repl, section_content)
+        if has_fragments and '<Fragments' in section_content:
+            section_content = FRAGMENTS_REGEX.sub(fragments_repl, section_content)
         
         # Add the processed section if it's not empty
         if section_content.strip():
@@ -154,12 +211,7 @@ def process_fragments(content: str, file_path: Path, platform: str, workspace_ro
                 # Process and add the current non-code section
                 non_code_content = '\n'.join(current_section)
                 # Remove imports only from non-code sections, with more precise pattern
-                non_code_content = re.sub(
-                    r'^\s*import\s+[a-zA-Z0-9_]+\s+from\s+[\'"](?:/)?[^\'\"]+[\'"]\s*;\s*\n?',
-                    '',
-                    non_code_content,
-                    flags=re.MULTILINE
-                )
+                non_code_content = DEFAULT_IMPORT_REGEX.sub('', non_code_content)
                 if non_code_content.strip():
                     result.append(non_code_content.strip())
                 current_section = []
@@ -173,12 +225,7 @@ def process_fragments(content: str, file_path: Path, platform: str, workspace_ro
     if current_section:
         non_code_content = '\n'.join(current_section)
         # Remove imports only from non-code sections, with more precise pattern
-        non_code_content = re.sub(
-            r'^\s*import\s+[a-zA-Z0-9_]+\s+from\s+[\'"](?:/)?[^\'\"]+[\'"]\s*;\s*\n?',
-            '',
-            non_code_content,
-            flags=re.MULTILINE
-        )
+        non_code_content = DEFAULT_IMPORT_REGEX.sub('', non_code_content)
         if non_code_content.strip():
             result.append(non_code_content.strip())
     
@@ -186,7 +233,7 @@ def process_fragments(content: str, file_path: Path, platform: str, workspace_ro
     content = '\n\n'.join(result)
     
     # Clean up multiple empty lines but preserve double newlines
-    content = re.sub(r'\n{3,}', '\n\n', content)
+    content = EXTRA_NEWLINES_REGEX.sub('\n\n', content)
     
     # Ensure file ends with exactly one newline
     content = content.rstrip() + '\n'
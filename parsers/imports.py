@@ -1,11 +1,15 @@
 """Functions for handling import statements in markdown/MDX content."""
 
 import re
+import sys
+import logging
 from pathlib import Path
 from typing import List
 
 from .code_blocks import split_content_and_code_blocks
 
+log = logging.getLogger(__name__)
+
 # Import removal patterns
 NEXTJS_IMPORT_PATTERNS = [
     r'^import\s*{\s*getCustomStaticPath\s*}\s*from\s*[\'"]@/utils/getCustomStaticPath[\'"];\s*\n?',
@@ -19,21 +23,39 @@ IMPORT_PATTERNS = [
     r'^import\s+schema\s+from\s+[\'"]\.?/.*?amplify-outputs-schema-v1\.json[\'"];?\s*\n?',
     # Icons imports
     r'^import\s*{[^}]+}\s*from\s*[\'"]@/components/Icons/[^\'"]+[\'"];?\s*$\n?',
-    # AWS Amplify UI and AI imports
-    r'^import\s*.*?\s*from\s*[\'"]@aws-amplify/ui-react[\'"].*?\n',
-    r'^import\s*.*?\s*from\s*[\'"]@aws-amplify/ui-react-ai[\'"].*?\n',
-    r'^import\s*.*?\s*from\s*[\'"]@/components/AI[^\'"]*[\'"].*?\n',
+    # AWS Amplify UI and AI imports. [ \t]* keeps a match from starting on a
+    # bare `import` line above the one being removed.
+    r'^import[ \t]*.*?\s*from\s*[\'"]@aws-amplify/ui-react[\'"].*?\n',
+    r'^import[ \t]*.*?\s*from\s*[\'"]@aws-amplify/ui-react-ai[\'"].*?\n',
+    r'^import[ \t]*.*?\s*from\s*[\'"]@/components/AI[^\'"]*[\'"].*?\n',
     # UI Wrapper imports
-    r'^import\s*.*?\s*from\s*[\'"]@/components/UIWrapper[\'"].*?\n',
+    r'^import[ \t]*.*?\s*from\s*[\'"]@/components/UIWrapper[\'"].*?\n',
     # Fragment imports
     r'^import\s+[a-zA-Z0-9_]+\s+from\s*[\'"](?:/)?src/fragments/.*?[\'"].*?\n',
     # Protected redaction message imports
     r'^import\s*{\s*ProtectedRedactionGen[12]Message\s*}\s*from\s*[\'"]@/protected/ProtectedRedactionMessage[\'"].*?\n'
 ]
 
+# Each pattern list joined into one alternation, so the text is scanned once
+NEXTJS_IMPORT_REGEX = re.compile('|'.join(f'(?:{p})' for p in NEXTJS_IMPORT_PATTERNS), re.MULTILINE)
+IMPORT_REGEX = re.compile('|'.join(f'(?:{p})' for p in IMPORT_PATTERNS), re.MULTILINE)
+
+# Any import line, used to report imports that aren't removed
+ALL_IMPORTS_REGEX = re.compile(r'^import\s+.*?;?\s*$', re.MULTILINE)
+
+# Quote characters accepted around JavaScript string literals
+QUOTES = '"\''
+
+# Fallback for array contents the split in extract_string_array can't handle
+STRING_LITERAL_REGEX = re.compile(r'["\']([^"\']*)["\']')
+
 def extract_string_array(array_str: str) -> List[str]:
     """Extract strings from a JavaScript array string.
     
+    The common case of a plain comma-separated list of quoted strings is
+    handled with a split; anything else (brackets, comments, identifiers)
+    falls back to the regex.
+    
     Args:
         array_str: A string containing a JavaScript array of strings
         
@@ -41,13 +63,25 @@ def extract_string_array(array_str: str) -> List[str]:
         A list of strings extracted from the array
         
     Example:
+        >>> extract_string_array("'angular',\\n  'vue',")
+        ['angular', 'vue']
         >>> extract_string_array('["react", "nextjs"]')
         ['react', 'nextjs']
         >>> extract_string_array("['angular', 'vue']")
         ['angular', 'vue']
     """
-    matches = re.findall(r'["\']([^"\']*)["\']', array_str)
-    return matches
+    values = []
+    for part in array_str.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        value = part[1:-1]
+        if (len(part) < 2 or part[0] not in QUOTES or part[-1] != part[0]
+                or '"' in value or "'" in value):
+            return STRING_LITERAL_REGEX.findall(array_str)
+        # Interned so platform comparisons are mostly pointer checks
+        values.append(sys.intern(value))
+    return values
 
 def remove_nextjs_imports(content: str) -> str:
     """Remove Next.js-specific imports from the content.
@@ -63,9 +97,10 @@ def remove_nextjs_imports(content: str) -> str:
         >>> remove_nextjs_imports(content)
         'Other content'
     """
-    for pattern in NEXTJS_IMPORT_PATTERNS:
-        content = re.sub(pattern, '', content, flags=re.MULTILINE)
-    return content
+    # Every pattern imports from @/utils/, most files have none of them
+    if '@/utils/' not in content:
+        return content
+    return NEXTJS_IMPORT_REGEX.sub('', content)
 
 def remove_imports(content: str, file_path: Path | None = None) -> str:
     """Remove specific imports while preserving code blocks.
@@ -88,44 +123,33 @@ def remove_imports(content: str, file_path: Path | None = None) -> str:
     parts = split_content_and_code_blocks(content)
     result = []
     
-    # Pattern to find all imports for logging
-    all_imports_pattern = re.compile(r'^import\s+.*?;?\s*$', re.MULTILINE)
-    
     # Collect all unfiltered imports across all non-code blocks
     unfiltered_imports = []
     
     for part, is_code_block in parts:
-        if not is_code_block:
-            # Get all imports in this non-code block
-            imports_to_check = [m.group(0).strip() for m in all_imports_pattern.finditer(part)]
-            
+        # Plain substring check first; prose without imports skips the regexes
+        if not is_code_block and 'import' in part:
             # Remove the imports we know we want to remove
-            filtered_part = part
-            for pattern in IMPORT_PATTERNS:
-                filtered_part = re.sub(pattern, '', filtered_part, flags=re.MULTILINE)
-            
-            # After removal, check which imports are still present
-            remaining_imports = [m.group(0).strip() for m in all_imports_pattern.finditer(filtered_part)]
+            filtered_part = IMPORT_REGEX.sub('', part)
             
-            # Only add to unfiltered_imports if the import wasn't matched by any of our patterns
-            for imp in remaining_imports:
-                should_log = True
-                for pattern in IMPORT_PATTERNS:
-                    if re.search(pattern, imp + '\n', re.MULTILINE):
-                        should_log = False
-                        break
-                if should_log:
-                    unfiltered_imports.append(imp)
+            # After removal, check which imports are still present. Only
+            # needed for the debug report, which requires a file path.
+            if file_path and log.isEnabledFor(logging.DEBUG):
+                for m in ALL_IMPORTS_REGEX.finditer(filtered_part):
+                    imp = m.group(0).strip()
+                    # Only report it if the import wasn't matched by any of our patterns
+                    if not IMPORT_REGEX.search(imp + '\n'):
+                        unfiltered_imports.append(imp)
             
             result.append(filtered_part)
         else:
             result.append(part)
     
     # Log all unfiltered imports together if any were found
-    if unfiltered_imports and file_path:
-        print(f"\nFile: {file_path}")
-        print("Unfiltered imports:")
-        for imp in unfiltered_imports:
-            print(f"  {imp}")
+    if unfiltered_imports:
+        log.debug(
+            "\nFile: %s\nUnfiltered imports:\n%s",
+            file_path, '\n'.join(f"  {imp}" for imp in unfiltered_imports)
+        )
     
     return ''.join(result) 
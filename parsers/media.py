@@ -5,6 +5,24 @@ from typing import List, Tuple, Optional
 from pathlib import Path
 from .media_description import analyze_doc_with_media
 
+# Markdown image syntax
+# ![Alt text](/path/to/image.png)
+IMAGE_REGEX = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+
+# Video component
+# Can handle:
+# <Video src="/path.mp4" description="Desc"/>
+# <Video description="Desc" src="/path.mp4"/>
+VIDEO_REGEX = re.compile(
+    r'<Video.*?' +  # Start of Video tag with any attributes
+    r'(?:' +  # Start of alternation for src/description order
+    r'src="([^"]+)".*?description="([^"]+)"|' +  # src then desc
+    r'description="([^"]+)".*?src="([^"]+)"' +  # desc then src
+    r')' +  # End of alternation
+    r'.*?(?:/>|></Video>|>\s*</Video>)',  # Any remaining attributes and closing, including multi-line
+    re.DOTALL
+)
+
 def extract_media_paths(content: str) -> List[Tuple[str, str, str, str]]:
     """Extract image and video file paths from markdown/MDX content.
     
@@ -29,28 +47,14 @@ def extract_media_paths(content: str) -> List[Tuple[str, str, str, str]]:
     media_paths = []
     
     # Match markdown image syntax
-    # ![Alt text](/path/to/image.png)
-    image_pattern = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
-    for match in image_pattern.finditer(content):
+    for match in IMAGE_REGEX.finditer(content):
         alt_text = match.group(1)
         file_path = match.group(2)
         full_tag = match.group(0)
         media_paths.append(('image', file_path, alt_text, full_tag))
     
     # Match Video component
-    # Can handle:
-    # <Video src="/path.mp4" description="Desc"/>
-    # <Video description="Desc" src="/path.mp4"/>
-    video_pattern = re.compile(
-        r'<Video.*?' +  # Start of Video tag with any attributes
-        r'(?:' +  # Start of alternation for src/description order
-        r'src="([^"]+)".*?description="([^"]+)"|' +  # src then desc
-        r'description="([^"]+)".*?src="([^"]+)"' +  # desc then src
-        r')' +  # End of alternation
-        r'.*?(?:/>|></Video>|>\s*</Video>)',  # Any remaining attributes and closing, including multi-line
-        re.DOTALL
-    )
-    for match in video_pattern.finditer(content):
+    for match in VIDEO_REGEX.finditer(content):
         file_path = match.group(1) or match.group(4)  # src from either position
         description = match.group(2) or match.group(3) or ''  # description from either position
         full_tag = match.group(0)
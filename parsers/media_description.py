@@ -1,14 +1,12 @@
 """Functions for generating descriptions of media files using Gemini."""
 
-import os
 import base64
+import os
 import tempfile
 import httpx
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, List
 from pydantic import BaseModel
-import google.generativeai as genai
-from google.ai.generativelanguage_v1beta.types import content
 import time
 import json
 from collections import deque
@@ -26,6 +24,25 @@ CACHE_DIR = Path.home() / ".llms_cache"
 # Create cache directory if it doesn't exist
 CACHE_DIR.mkdir(exist_ok=True)
 
+# Gemini client module, imported and configured on first use
+_GENAI = None
+
+def _get_genai():
+    """Import and configure the Gemini client the first time it is needed.
+
+    Importing google.generativeai takes several hundred milliseconds, so it is
+    deferred until a document actually has media to describe.
+
+    Returns:
+        The configured google.generativeai module
+    """
+    global _GENAI
+    if _GENAI is None:
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
+        _GENAI = genai
+    return _GENAI
+
 class MediaContext(BaseModel):
     """Context for a media file within a document."""
     file_path: str
@@ -136,7 +153,17 @@ def download_media_file(src: str) -> Optional[str]:
         print(f"{YELLOW}🔄 Cache MISS - Downloading {url} to {cache_path}{RESET}")
         response = httpx.get(url)
         response.raise_for_status()
-        cache_path.write_bytes(response.content)
+        # Platforms render in parallel and can download the same file at
+        # once, so write a temporary file and rename it into place. Readers
+        # then see either no file or the complete one.
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=f".{safe_filename}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(response.content)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
         print(f"{GREEN}✅ Download successful{RESET}")
             
         return str(cache_path)
@@ -214,6 +241,9 @@ def analyze_doc_with_media(
             media_contexts=[]
         )
 
+    genai = _get_genai()
+    from google.ai.generativelanguage_v1beta.types import content
+
     if api_key:
         print("Configuring Gemini with provided API key")
         genai.configure(api_key=api_key)
@@ -382,7 +412,7 @@ def upload_to_gemini(path: str, mime_type: Optional[str] = None):
         path: Path to the file to upload
         mime_type: Optional MIME type of the file
     """
-    file = genai.upload_file(path, mime_type=mime_type)
+    file = _get_genai().upload_file(path, mime_type=mime_type)
     print(f"Uploaded file '{file.display_name}' as: {file.uri}")
     return file
 
@@ -392,6 +422,7 @@ def wait_for_files_active(files: List) -> None:
     Some files uploaded to the Gemini API need to be processed before they can be
     used as prompt inputs.
     """
+    genai = _get_genai()
     print("Waiting for file processing...")
     for name in (file.name for file in files):
         file = genai.get_file(name)
@@ -1,23 +1,170 @@
 """Functions for handling metadata and schema processing in MDX files."""
 
 import re
-import json
+import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 from .imports import remove_nextjs_imports, extract_string_array
 from .exports import remove_nextjs_exports
 from .components import embed_schema
+from .utils import collapse_blank_lines
 
-# Regex for extracting meta exports and specific fields
-META_REGEX = re.compile(
-    r"export\s+const\s+meta\s*=\s*({[\s\S]*?});",
-    re.MULTILINE | re.DOTALL
+log = logging.getLogger(__name__)
+
+try:
+    # Optional: RE2 matches in linear time without backtracking. These
+    # patterns avoid backreferences and lookarounds so either engine works.
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+
+# Regex for the start of the meta export; the object itself is delimited by find_meta_block
+META_START_REGEX = _regex_engine.compile(r"export\s+const\s+meta\s*=\s*\{")
+
+# Characters find_meta_block acts on: braces, string openers and comment starts
+META_TOKEN_REGEX = re.compile(r'[{}"\'`]|//|/\*')
+
+# A whole string literal from its opening quote, keyed by the quote character
+META_STRING_REGEXES = {
+    quote: re.compile(quote + r'(?:[^' + quote + r'\\]|\\[\s\S])*+' + quote)
+    for quote in '"\'`'
+}
+
+# Matches any of the title, description and platforms fields in one pass.
+# Title values can't contain quotes, descriptions may contain the other
+# quote character, and platforms captures the raw array contents. Every
+# repetition is a negated class that stops at its delimiter, so a failed
+# match never backtracks through a lazy quantifier.
+FIELDS_REGEX = _regex_engine.compile(
+    r'["\']?(?:'
+    r'title["\']?\s*:\s*["\'](?P<title>[^"\']*)["\']|'
+    r'description["\']?\s*:\s*(?:"(?P<description_dq>[^"\n]*)"|\'(?P<description_sq>[^\'\n]*)\')|'
+    r'platforms["\']?\s*:\s*\[(?P<platforms>[^\]]*)\]'
+    r')'
 )
 
-TITLE_REGEX = re.compile(r'["\']?title["\']?\s*:\s*["\']([^"\']*)["\']')
-DESCRIPTION_REGEX = re.compile(r'["\']?description["\']?\s*:\s*(["\'])((?:(?!\1).)*)\1')
-PLATFORMS_REGEX = re.compile(r'["\']?platforms["\']?\s*:\s*\[(.*?)\]', re.DOTALL)
+# Characters that can't start a plain (unquoted) YAML scalar
+YAML_INDICATORS = '-?:,[]{}#&*!|>\'"%@`'
+
+# Plain scalars a YAML 1.1 (or 1.2) loader resolves to something other than a
+# string: bools, nulls, ints (binary, octal, hex, sexagesimal), floats,
+# timestamps, and the merge (<<) and value (=) keys. Matched against the whole value.
+YAML_NON_STRING_REGEX = re.compile(
+    r'=|<<|'
+    r'y|Y|yes|Yes|YES|n|N|no|No|NO|true|True|TRUE|false|False|FALSE|on|On|ON|off|Off|OFF|'
+    r'~|null|Null|NULL|'
+    r'[-+]?(?:0b[01_]+|0o[0-7_]+|0x[0-9a-fA-F_]+|[0-9][0-9_]*(?::[0-5]?[0-9])*)|'
+    r'[-+]?(?:[0-9][0-9_]*)?\.[0-9_]*(?:[eE][-+]?[0-9]+)?|'
+    r'[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\.[0-9_]*|'
+    r'[-+]?[0-9]+(?:\.[0-9]*)?[eE][-+]?[0-9]+|'
+    r'[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN)|'
+    r'[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}(?:[Tt ].*)?'
+)
+
+def _yaml_scalar(value: str) -> str:
+    """Format a string as a YAML scalar, quoting only when a plain scalar would be misread.
+    
+    Args:
+        value: The string to format
+        
+    Returns:
+        The string unchanged if it is a safe plain scalar, otherwise double-quoted
+        
+    Example:
+        >>> _yaml_scalar("Learn about Amplify's PubSub category")
+        "Learn about Amplify's PubSub category"
+        >>> _yaml_scalar('Build a backend: the guide')
+        '"Build a backend: the guide"'
+        >>> [_yaml_scalar(v) for v in ('1.0', '404', 'Null', '~', 'no', 'true')]
+        ['"1.0"', '"404"', '"Null"', '"~"', '"no"', '"true"']
+        >>> _yaml_scalar('Version 1.0')
+        'Version 1.0'
+        >>> print(_yaml_scalar('a\\tb'), _yaml_scalar('<<'), _yaml_scalar('='))
+        "a\\x09b" "<<" "="
+    """
+    if (value and value == value.strip() and value[0] not in YAML_INDICATORS
+            and ': ' not in value and ' #' not in value
+            and not value.endswith(':') and value.isprintable()
+            and not YAML_NON_STRING_REGEX.fullmatch(value)):
+        return value
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    if not escaped.isprintable():
+        # Tabs, control characters and YAML line breaks like U+0085
+        escaped = ''.join(char if char.isprintable() else _yaml_escape(char) for char in escaped)
+    return f'"{escaped}"'
+
+def _yaml_escape(char: str) -> str:
+    """Escape one character for a double-quoted YAML scalar."""
+    code = ord(char)
+    if code <= 0xFF:
+        return f'\\x{code:02x}'
+    if code <= 0xFFFF:
+        return f'\\u{code:04x}'
+    return f'\\U{code:08x}'
+
+def find_meta_block(content: str) -> Optional[Tuple[int, int, str]]:
+    """Find the `export const meta = {...};` block in MDX content.
+    
+    The object is delimited by counting braces (ignoring any inside string
+    literals and comments), so nested objects are handled correctly.
+    
+    Args:
+        content: The MDX content to search
+        
+    Returns:
+        A tuple of (start, end, meta_str) where start/end span the whole export
+        statement and meta_str is the object literal, or None if not found
+        
+    Example:
+        >>> start, end, meta_str = find_meta_block('x\\nexport const meta = { a: { b: "}" } };\\ny')
+        >>> meta_str
+        '{ a: { b: "}" } }'
+        >>> 'x\\nexport const meta = { a: { b: "}" } };\\ny'[end:]
+        '\\ny'
+    """
+    start_match = META_START_REGEX.search(content)
+    if not start_match:
+        return None
+    
+    obj_start = start_match.end() - 1
+    depth = 0
+    pos = obj_start
+    # Jump between the characters that matter instead of stepping one at a time
+    while True:
+        token_match = META_TOKEN_REGEX.search(content, pos)
+        if not token_match:
+            return None
+        token = token_match.group()
+        if token in META_STRING_REGEXES:
+            # Skip the whole literal, escapes included
+            string_match = META_STRING_REGEXES[token].match(content, token_match.start())
+            if not string_match:
+                return None
+            pos = string_match.end()
+        elif token == '//':
+            pos = content.find('\n', token_match.end())
+            if pos == -1:
+                return None
+            pos += 1
+        elif token == '/*':
+            pos = content.find('*/', token_match.end())
+            if pos == -1:
+                return None
+            pos += 2
+        elif token == '{':
+            depth += 1
+            pos = token_match.end()
+        else:
+            depth -= 1
+            if depth == 0:
+                obj_end = end = token_match.end()
+                # Include the statement's trailing semicolon
+                if content.startswith(';', end):
+                    end += 1
+                return start_match.start(), end, content[obj_start:obj_end]
+            pos = token_match.end()
 
 def convert_meta_to_frontmatter(meta: Dict) -> str:
     """Convert meta dictionary to frontmatter format.
@@ -42,22 +189,41 @@ def convert_meta_to_frontmatter(meta: Dict) -> str:
     
     lines = ["---"]
     if 'title' in meta:
-        lines.append(f"title: {meta['title']}")
+        lines.append(f"title: {_yaml_scalar(meta['title'])}")
     if 'description' in meta:
-        lines.append(f"description: {meta['description']}")
+        lines.append(f"description: {_yaml_scalar(meta['description'])}")
     lines.append("---")
     lines.append("")  # Add an empty line after the frontmatter
     
     return "\n".join(lines)
 
-def extract_meta_from_file(file_path: Path) -> Tuple[Dict, str]:
+def read_mdx_file(file_path: Path) -> str:
+    """Read an MDX file.
+    
+    Args:
+        file_path: Path to the MDX file to read
+        
+    Returns:
+        The raw file content
+        
+    Raises:
+        OSError: If the file can't be read
+        UnicodeDecodeError: If the file isn't valid UTF-8
+    """
+    return file_path.read_text(encoding='utf-8')
+
+def extract_meta_from_file(file_path: Path, source: Optional[str] = None) -> Tuple[Dict, str]:
     """Extract meta information from an MDX file.
     
     This function reads an MDX file, processes its content to extract metadata,
-    and returns both the metadata and the processed content.
+    and returns both the metadata and the processed content. Results are cached
+    per (path, mtime), so each file is only read and parsed once per run even
+    though it is visited once for every platform.
     
     Args:
         file_path: Path to the MDX file to process
+        source: The file's raw content if the caller has already read it.
+            It is parsed directly instead of reading the file again.
         
     Returns:
         A tuple containing:
@@ -81,9 +247,33 @@ def extract_meta_from_file(file_path: Path) -> Tuple[Dict, str]:
         >>> 'Other content' in processed
         True
     """
+    if source is not None:
+        return _parse_meta(source, file_path)
+    
+    try:
+        mtime_ns = file_path.stat().st_mtime_ns
+    except OSError as e:
+        log.error("Error reading %s: %s", file_path, e)
+        return {}, ""
+    
+    meta_dict, content = _extract_meta_cached(str(file_path), mtime_ns)
+    # Hand out a copy so callers can't mutate the cached entry
+    return dict(meta_dict), content
+
+@lru_cache(maxsize=None)
+def _extract_meta_cached(path_str: str, mtime_ns: int) -> Tuple[Dict, str]:
+    """Read and parse an MDX file. Keyed by mtime so edited files are re-read."""
+    file_path = Path(path_str)
+    try:
+        content = read_mdx_file(file_path)
+    except (OSError, UnicodeDecodeError) as e:
+        log.error("Error reading %s: %s", file_path, e)
+        return {}, ""
+    return _parse_meta(content, file_path)
+
+def _parse_meta(content: str, file_path: Path) -> Tuple[Dict, str]:
+    """Parse the raw content of an MDX file into its meta and remaining content."""
     try:
-        content = file_path.read_text(encoding='utf-8')
-        
         # First embed any schemas - do this BEFORE removing imports
         content = embed_schema(content, file_path)
         
@@ -91,37 +281,30 @@ def extract_meta_from_file(file_path: Path) -> Tuple[Dict, str]:
         content = remove_nextjs_imports(content)  # Only removes specific Next.js imports
         content = remove_nextjs_exports(content)
         
-        match = META_REGEX.search(content)
-        if match:
-            meta_str = match.group(1)
+        meta_block = find_meta_block(content)
+        if meta_block:
+            start, end, meta_str = meta_block
             
-            # Extract just the fields we need
+            # Extract just the fields we need, keeping the first occurrence of each
             meta_dict = {}
+            for field_match in FIELDS_REGEX.finditer(meta_str):
+                if field_match.group('title') is not None:
+                    meta_dict.setdefault('title', field_match.group('title'))
+                elif field_match.group('description_dq') is not None:
+                    meta_dict.setdefault('description', field_match.group('description_dq'))
+                elif field_match.group('description_sq') is not None:
+                    meta_dict.setdefault('description', field_match.group('description_sq'))
+                elif 'platforms' not in meta_dict:
+                    meta_dict['platforms'] = extract_string_array(field_match.group('platforms'))
             
-            # Extract title
-            title_match = TITLE_REGEX.search(meta_str)
-            if title_match:
-                meta_dict['title'] = title_match.group(1)
-            
-            # Extract description
-            desc_match = DESCRIPTION_REGEX.search(meta_str)
-            if desc_match:
-                meta_dict['description'] = desc_match.group(2)
-            
-            # Extract platforms
-            platforms_match = PLATFORMS_REGEX.search(meta_str)
-            if platforms_match:
-                platforms_str = platforms_match.group(1)
-                meta_dict['platforms'] = extract_string_array(platforms_str)
-            
-            # Remove the meta export from content
-            content = META_REGEX.sub('', content)
+            # Remove the meta export from content using the span we already have
+            content = content[:start] + content[end:]
             
             # Clean up any remaining empty lines
-            content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
+            content = collapse_blank_lines(content)
             
             return meta_dict, content
         return {}, content
     except Exception as e:
-        print(f"Error reading {file_path}: {e}")
+        log.error("Error parsing %s: %s", file_path, e)
         return {}, "" 
@@ -1,9 +1,14 @@
 """Functions for handling platform-specific processing in MDX content."""
 
+import json
+import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, FrozenSet, Optional
 
-from .meta import extract_meta_from_file
+from .imports import extract_string_array
+from .meta import FIELDS_REGEX, find_meta_block, read_mdx_file
+
+log = logging.getLogger(__name__)
 
 # List of supported platforms
 PLATFORMS = [
@@ -18,14 +23,25 @@ PLATFORMS = [
     "flutter"
 ]
 
-def extract_platforms_from_file(file_path: Path) -> Optional[List[str]]:
+# For membership tests and validating parsed platform lists
+PLATFORMS_SET = frozenset(PLATFORMS)
+
+# File in the output root recording each source directory's platforms, so
+# later runs can skip excluded subtrees without reading their index.mdx
+PLATFORMS_MANIFEST_NAME = ".platforms-manifest.json"
+
+def extract_platforms_from_file(file_path: Path) -> Optional[FrozenSet[str]]:
     """Extract platforms array from index.mdx meta.
     
+    Only the platforms field is parsed, so this is cheap enough to use as a
+    filter before doing the full meta extraction.
+    
     Args:
         file_path: Path to the MDX file to extract platforms from
         
     Returns:
-        List of platform strings if found, None otherwise
+        Set of supported platforms listed in the meta, or None if the meta
+        has no (or an empty) platforms array
         
     Example:
         >>> content = '''
@@ -35,10 +51,90 @@ def extract_platforms_from_file(file_path: Path) -> Optional[List[str]]:
         ... '''
         >>> Path('test.mdx').write_text(content)
         >>> result = extract_platforms_from_file(Path('test.mdx'))
-        >>> result == ["nextjs", "react"]
+        >>> result == frozenset({"nextjs", "react"})
         True
     """
-    meta, _ = extract_meta_from_file(file_path)
-    if "platforms" in meta and isinstance(meta["platforms"], list):
-        return meta["platforms"]
-    return None 
+    try:
+        content = read_mdx_file(file_path)
+    except (OSError, UnicodeDecodeError) as e:
+        log.error("Error reading %s: %s", file_path, e)
+        return None
+    
+    return extract_platforms(content)
+
+def extract_platforms(content: str) -> Optional[FrozenSet[str]]:
+    """Extract the platforms array from the meta in MDX content.
+    
+    Args:
+        content: Raw MDX content
+        
+    Returns:
+        Set of supported platforms listed in the meta, or None if the meta
+        has no (or an empty) platforms array
+        
+    Example:
+        >>> extract_platforms('export const meta = { platforms: ["vue", "nope"] };')
+        frozenset({'vue'})
+    """
+    meta_block = find_meta_block(content)
+    if not meta_block:
+        return None
+    
+    for field_match in FIELDS_REGEX.finditer(meta_block[2]):
+        if field_match.group('platforms') is not None:
+            platforms = extract_string_array(field_match.group('platforms'))
+            # Unknown platform names can never match, so drop them here
+            return frozenset(platforms) & PLATFORMS_SET if platforms else None
+    return None
+
+def load_platforms_manifest(manifest_path: Path) -> Dict[str, Dict]:
+    """Load the platforms manifest written by a previous run.
+    
+    Args:
+        manifest_path: Path to the manifest JSON file
+        
+    Returns:
+        Dict mapping source-relative directory paths to
+        {"mtime_ns": ..., "platforms": [...]} entries, empty if there is
+        no usable manifest. Malformed entries are dropped.
+    """
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        log.error("Ignoring unreadable platforms manifest %s: %s", manifest_path, e)
+        return {}
+    if not isinstance(manifest, dict):
+        return {}
+    return {
+        rel_dir: entry
+        for rel_dir, entry in manifest.items()
+        if _is_manifest_entry(entry)
+    }
+
+def _is_manifest_entry(entry) -> bool:
+    """Check an entry has an int mtime_ns and a list of names (or None) as platforms."""
+    if not isinstance(entry, dict):
+        return False
+    mtime_ns = entry.get("mtime_ns")
+    if not isinstance(mtime_ns, int) or isinstance(mtime_ns, bool):
+        return False
+    platforms = entry.get("platforms")
+    return platforms is None or (
+        isinstance(platforms, list) and all(isinstance(name, str) for name in platforms)
+    )
+
+def save_platforms_manifest(manifest_path: Path, manifest: Dict[str, Dict]) -> None:
+    """Write the platforms manifest for the next run.
+    
+    Args:
+        manifest_path: Path to the manifest JSON file
+        manifest: Entries as returned by load_platforms_manifest
+    """
+    try:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding='utf-8')
+    except OSError as e:
+        log.error("Error writing platforms manifest %s: %s", manifest_path, e)
@@ -1,6 +1,27 @@
 """Utility functions for MDX processing."""
 
+import re
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
+
+# Three or more line breaks (with only whitespace between), collapsed to one blank line
+BLANK_LINES_REGEX = re.compile(r'\n\s*\n\s*\n')
+
+def collapse_blank_lines(text: str) -> str:
+    """Collapse runs of blank lines into a single blank line.
+    
+    Args:
+        text: The text to clean up
+        
+    Returns:
+        The text with no more than one blank line in a row
+        
+    Example:
+        >>> collapse_blank_lines('First\\n\\n\\n\\nSecond')
+        'First\\n\\nSecond'
+    """
+    return BLANK_LINES_REGEX.sub('\n\n', text)
 
 def get_workspace_root(file_path: Path) -> Path:
     """Find the workspace root by looking for src directory.
@@ -20,12 +41,24 @@ def get_workspace_root(file_path: Path) -> Path:
         >>> root.name == 'test'
         True
     """
-    current = file_path.resolve()  # Resolve any symlinks and get absolute path
-    while current != current.parent:  # Stop at root directory
-        if (current / "src").is_dir():  # Check if src exists and is a directory
-            return current
-        if current.name == "src" and current.parent.is_dir():  # If we're in src, return parent
-            return current.parent
-        current = current.parent
-    # If we can't find src directory, use the directory containing the file
-    return file_path.parent 
+    # Resolve any symlinks and get absolute path
+    workspace_root = _find_workspace_root(file_path.resolve())
+    if workspace_root is None:
+        # If we can't find src directory, use the directory containing the file
+        return file_path.parent
+    return workspace_root
+
+@lru_cache(maxsize=None)
+def _find_workspace_root(current: Path) -> Optional[Path]:
+    """Climb from an absolute path to the directory containing src/, or None.
+    
+    Cached per path, so pages in the same tree share the checks on every
+    ancestor they have in common.
+    """
+    if current == current.parent:  # Stop at root directory
+        return None
+    if (current / "src").is_dir():  # Check if src exists and is a directory
+        return current
+    if current.name == "src" and current.parent.is_dir():  # If we're in src, return parent
+        return current.parent
+    return _find_workspace_root(current.parent) 
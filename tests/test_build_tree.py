@@ -0,0 +1,47 @@
+"""Tests for build_tree in main.py."""
+
+from collections import Counter
+from pathlib import Path
+
+import main
+
+
+def test_each_index_file_is_read_once(tmp_path, monkeypatch):
+    for i in range(200):
+        page = tmp_path / f"page{i}"
+        page.mkdir()
+        (page / "index.mdx").write_text(
+            'export const meta = { title: "Page", platforms: ["react"] };\nBody\n'
+        )
+    
+    reads = Counter()
+    read_text = Path.read_text
+    def counting_read_text(self, *args, **kwargs):
+        reads[str(self)] += 1
+        return read_text(self, *args, **kwargs)
+    monkeypatch.setattr(Path, "read_text", counting_read_text)
+    
+    root = main.build_tree(tmp_path, ["react", "vue"], {})
+    assert len(root.children) == 200
+    assert all(node.content.strip() == "Body" for node in root.children)
+    assert all(node.source is None for node in root.children)
+    assert len(reads) == 200 and set(reads.values()) == {1}
+
+
+def test_undecodable_index_file_is_logged_not_fatal(tmp_path, caplog):
+    (tmp_path / "index.mdx").write_text('export const meta = { title: "Root" };\n')
+    bad = tmp_path / "bad"
+    bad.mkdir()
+    (bad / "index.mdx").write_bytes(
+        'export const meta = { title: "Café" };\nBody\n'.encode("latin-1")
+    )
+    good = tmp_path / "good"
+    good.mkdir()
+    (good / "index.mdx").write_text('export const meta = { title: "Good" };\nBody\n')
+    
+    root = main.build_tree(tmp_path, ["react"], {})
+    
+    nodes = {node.name: node for node in root.children}
+    assert nodes["good"].meta == {"title": "Good"}
+    assert nodes["bad"].meta == {} and nodes["bad"].content == ""
+    assert "Error reading" in caplog.text
@@ -0,0 +1,32 @@
+"""Tests for fragment expansion."""
+
+import logging
+
+from parsers.fragments import process_fragments
+
+
+def test_fragment_including_itself_is_reported_not_recursed(tmp_path, caplog):
+    (tmp_path / "src").mkdir()
+    fragment = tmp_path / "src" / "loop.mdx"
+    fragment.write_text(
+        "import loop from '/src/loop.mdx';\n"
+        "\n"
+        "Fragment text\n"
+        "\n"
+        "<Fragments fragments={{react: loop}} />\n"
+    )
+    page = tmp_path / "src" / "index.mdx"
+    content = (
+        "import loop from '/src/loop.mdx';\n"
+        "\n"
+        "Page text\n"
+        "\n"
+        "<Fragments fragments={{react: loop}} />\n"
+    )
+    
+    with caplog.at_level(logging.ERROR, logger="parsers.fragments"):
+        result = process_fragments(content, page, "react", tmp_path)
+    
+    assert "Page text" in result
+    assert result.count("Fragment text") == 1
+    assert "Fragment includes itself" in caplog.text
@@ -0,0 +1,26 @@
+"""Tests for import removal in parsers/imports.py."""
+
+import pytest
+
+from parsers.imports import remove_imports
+
+
+@pytest.mark.parametrize("removed", [
+    "import { View } from '@aws-amplify/ui-react';",
+    "import { AIConversation } from '@aws-amplify/ui-react-ai';",
+    "import { Chat } from '@/components/AI/Chat';",
+    "import { UIWrapper } from '@/components/UIWrapper';",
+])
+def test_bare_import_line_before_removed_import_is_kept(removed):
+    content = f"import\n{removed}\nText\n"
+    assert remove_imports(content) == "import\nText\n"
+
+
+def test_bare_import_line_between_removed_imports_is_kept():
+    content = (
+        "import outputs from './amplify-outputs-schema-v1.json';\n"
+        "import\n"
+        "import { View } from '@aws-amplify/ui-react';\n"
+        "Text\n"
+    )
+    assert remove_imports(content) == "import\nText\n"
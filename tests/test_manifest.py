@@ -0,0 +1,87 @@
+"""Tests for the platforms manifest and its use by build_tree."""
+
+import json
+import os
+
+import main
+from parsers.platforms import load_platforms_manifest, save_platforms_manifest
+
+
+def write_page(directory, platforms):
+    directory.mkdir(parents=True, exist_ok=True)
+    index_file = directory / "index.mdx"
+    index_file.write_text(
+        "export const meta = {\n"
+        '  title: "Page",\n'
+        f"  platforms: {platforms!r}\n"
+        "};\n"
+        "Body\n"
+    )
+    return index_file
+
+
+def test_manifest_round_trip(tmp_path):
+    manifest_path = tmp_path / "out" / ".platforms-manifest.json"
+    manifest = {"a": {"mtime_ns": 1, "platforms": ["react"]}, ".": {"mtime_ns": 2, "platforms": None}}
+    save_platforms_manifest(manifest_path, manifest)
+    assert load_platforms_manifest(manifest_path) == manifest
+
+
+def test_missing_or_corrupt_manifest_is_empty(tmp_path):
+    manifest_path = tmp_path / ".platforms-manifest.json"
+    assert load_platforms_manifest(manifest_path) == {}
+    manifest_path.write_text("{not json")
+    assert load_platforms_manifest(manifest_path) == {}
+    manifest_path.write_text("[]")
+    assert load_platforms_manifest(manifest_path) == {}
+
+
+def test_build_tree_records_and_uses_manifest(tmp_path):
+    write_page(tmp_path, ["react", "vue"])
+    child = write_page(tmp_path / "child", ["vue"])
+    
+    manifest = {}
+    root = main.build_tree(tmp_path, ["react", "vue"], manifest)
+    assert [node.name for node in root.children] == ["child"]
+    assert manifest["child"] == {"mtime_ns": child.stat().st_mtime_ns, "platforms": ["vue"]}
+    
+    # A matching entry is trusted without reading index.mdx
+    manifest["child"]["platforms"] = ["swift"]
+    root = main.build_tree(tmp_path, ["react", "vue"], manifest)
+    assert root.children == []
+    
+    # An edited index.mdx is read again
+    stat = child.stat()
+    os.utime(child, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    root = main.build_tree(tmp_path, ["react", "vue"], manifest)
+    assert [node.name for node in root.children] == ["child"]
+    assert manifest["child"]["platforms"] == ["vue"]
+
+
+def test_malformed_manifest_entries_are_dropped(tmp_path):
+    manifest_path = tmp_path / ".platforms-manifest.json"
+    manifest_path.write_text(json.dumps({
+        "good": {"mtime_ns": 1, "platforms": ["react"]},
+        "none": {"mtime_ns": 2, "platforms": None},
+        "list": ["react"],
+        "string": "react",
+        "float_mtime": {"mtime_ns": 1.5, "platforms": None},
+        "missing_mtime": {"platforms": None},
+        "string_platforms": {"mtime_ns": 3, "platforms": "react"},
+    }))
+    assert load_platforms_manifest(manifest_path) == {
+        "good": {"mtime_ns": 1, "platforms": ["react"]},
+        "none": {"mtime_ns": 2, "platforms": None},
+    }
+
+
+def test_unreadable_index_file_is_not_recorded(tmp_path):
+    write_page(tmp_path, ["react"])
+    bad = tmp_path / "bad"
+    bad.mkdir()
+    (bad / "index.mdx").write_bytes(b'export const meta = { title: "Caf\xe9" };\n')
+    
+    manifest = {"bad": {"mtime_ns": 0, "platforms": ["react"]}}
+    main.build_tree(tmp_path, ["react"], manifest)
+    assert "bad" not in manifest
+    assert "." in manifest
@@ -0,0 +1,29 @@
+"""Tests for frontmatter generation in parsers/meta.py."""
+
+import pytest
+
+from parsers.meta import _yaml_scalar
+
+yaml = pytest.importorskip("yaml")
+
+
+@pytest.mark.parametrize("value", [
+    "Set up Amplify",
+    "Learn about Amplify's PubSub category",
+    "Build a backend: the guide",
+    "Comments # here",
+    "trailing:",
+    "- list item",
+    '"quoted"',
+    "back\\slash",
+    "true", "no", "Yes", "On", "off", "y",
+    "null", "Null", "~",
+    "404", "+1", "0x1F", "0o17", "0b101", "1_000", "12:30",
+    "1.0", ".5", "1e3", ".inf", ".NaN",
+    "2024-01-01", "2024-01-01 10:00:00",
+    "=", "<<",
+    "a\tb", "line\nbreak", "next\x85line", "sep\u2028line", "bell\x07", "nul\x00",
+    "wide \U0001F600 char", " leading space", "trailing space ",
+])
+def test_yaml_scalar_round_trips(value):
+    assert yaml.safe_load(f"t: {_yaml_scalar(value)}")["t"] == value
@@ -0,0 +1,74 @@
+"""Tests for write_output in main.py."""
+
+import os
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def written_outputs(monkeypatch):
+    """Start every test with no outputs recorded."""
+    monkeypatch.setattr(main, "WRITTEN_OUTPUTS", {})
+
+
+def test_identical_outputs_are_hardlinked(tmp_path):
+    a, b = tmp_path / "a.md", tmp_path / "b.md"
+    main.write_output(str(a), "same\n")
+    main.write_output(str(b), "same\n")
+    assert b.read_text() == "same\n"
+    assert os.path.samefile(a, b)
+
+
+def test_unchanged_file_is_left_alone(tmp_path):
+    a = tmp_path / "a.md"
+    a.write_text("same\n")
+    inode = a.stat().st_ino
+    main.write_output(str(a), "same\n")
+    assert a.stat().st_ino == inode
+    assert main.WRITTEN_OUTPUTS
+
+
+def test_link_from_previous_run_is_not_written_through(tmp_path):
+    a, b = tmp_path / "a.md", tmp_path / "b.md"
+    a.write_text("OLD\n")
+    os.link(a, b)
+    main.write_output(str(a), "NEW\n")
+    assert a.read_text() == "NEW\n"
+    assert b.read_text() == "OLD\n"
+
+
+def test_interleaved_writer_never_links_stale_content(tmp_path, monkeypatch):
+    # Outputs left by a previous run, hardlinked to each other
+    a, b = tmp_path / "a.md", tmp_path / "b.md"
+    a.write_text("OLD\n")
+    os.link(a, b)
+    
+    # Run another platform's write while a.md still holds the old content
+    real_replace = os.replace
+    interleaved = []
+    def replace(src, dst):
+        if not interleaved:
+            interleaved.append(dst)
+            main.write_output(str(b), "NEW CONTENT\n")
+        real_replace(src, dst)
+    monkeypatch.setattr(os, "replace", replace)
+    
+    main.write_output(str(a), "NEW CONTENT\n")
+    assert interleaved == [str(a)]
+    assert a.read_text() == "NEW CONTENT\n"
+    assert b.read_text() == "NEW CONTENT\n"
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_failed_write_leaves_no_temporary_file(tmp_path, monkeypatch):
+    a = tmp_path / "a.md"
+    def replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", replace)
+    
+    with pytest.raises(OSError):
+        main.write_output(str(a), "NEW\n")
+    assert list(tmp_path.iterdir()) == []
+    assert not main.WRITTEN_OUTPUTS